@@ -1 +1,2 @@
-from pure_python_gcm.main import encrypt, decrypt
+from pure_python_gcm.aes_gcm_128 import GCMContext
+from pure_python_gcm.main import encrypt, decrypt, encrypt_many, decrypt_many
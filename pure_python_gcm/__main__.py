@@ -0,0 +1,58 @@
+"""Command line file encryption: python -m pure_python_gcm --help"""
+import argparse
+import sys
+from binascii import unhexlify
+from time import perf_counter
+
+from pure_python_gcm.files import decrypt_file, encrypt_file
+
+
+def read_key(path):
+    """Read a key file: 16 raw bytes, or 32 hex digits."""
+    with open(path, 'rb') as f:
+        key = f.read()
+    if len(key) != 16:
+        try:
+            key = unhexlify(key.strip())
+        except ValueError:
+            pass
+    if len(key) != 16:
+        raise ValueError("Key file must hold 16 bytes or 32 hex digits.")
+    return key
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m pure_python_gcm',
+        description="Encrypt or decrypt a file with AES-GCM-128. Encrypted "
+                    "files are IV + ciphertext + tag.")
+    parser.add_argument('mode', choices=['encrypt', 'decrypt'])
+    parser.add_argument('key_file',
+                        help="file holding the key, as 16 raw bytes "
+                             "or 32 hex digits")
+    parser.add_argument('in_path')
+    parser.add_argument('out_path')
+    parser.add_argument('--assoc-data', default='',
+                        help="additional data to authenticate, as a string")
+    args = parser.parse_args(argv)
+    assoc_data = args.assoc_data.encode('utf-8')
+    start = perf_counter()
+    try:
+        key = read_key(args.key_file)
+        if args.mode == 'encrypt':
+            length = encrypt_file(key, args.in_path, args.out_path, assoc_data)
+        else:
+            length = decrypt_file(key, args.in_path, args.out_path, assoc_data)
+    except (OSError, ValueError) as e:
+        print("{0} failed: {1}".format(args.mode.capitalize(), e),
+              file=sys.stderr)
+        return 1
+    seconds = perf_counter() - start
+    print("{0}ed {1} bytes in {2:.3f} s ({3:.2f} MB/s)".format(
+        args.mode.capitalize(), length, seconds, length / seconds / 10**6),
+        file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
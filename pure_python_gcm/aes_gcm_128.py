@@ -1,17 +1,128 @@
+import struct
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from hmac import compare_digest
+from os import urandom
+from time import perf_counter
+
 import pure_python_gcm.constants as const
 from pure_python_gcm.gf2k.defined_fields import GF2_128
-from pure_python_gcm.utilities import encrypt_block
+from pure_python_gcm.ghash import (AggregatedGHASH, GHASHTable, check_blocks,
+                                   ghash_update)
+from pure_python_gcm.utilities import as_bytes, ecb_encryptor
+
+
+# Number of blocks of keystream GCTR asks AES for at once.
+GCTR_CHUNK_BLOCKS = 4096
+
+
+class GCMStats:
+    """Counts and wall time for each stage of GCM, filled in by instrument.
+
+    The stages are
+        subkey: the AES call deriving H from the key
+        iv_ghash: hashing an IV that isn't 12 bytes into J0
+        gctr: keystream and xor, including the one block for the tag
+        padding: gcm_pad joining up the associated data and cipher
+        tag_ghash: hashing the padded data for the tag
+    and for each there are calls, bytes, blocks, aes_calls and seconds.
+    """
+    STAGES = ('subkey', 'iv_ghash', 'gctr', 'padding', 'tag_ghash')
+
+    def __init__(self):
+        self.stages = {stage: {'calls': 0, 'bytes': 0, 'blocks': 0,
+                               'aes_calls': 0, 'seconds': 0.0}
+                       for stage in self.STAGES}
+
+    def record(self, stage, seconds, n_bytes, aes_calls):
+        """Add one call of a stage, on n_bytes of data."""
+        counts = self.stages[stage]
+        counts['calls'] += 1
+        counts['bytes'] += n_bytes
+        counts['blocks'] += (n_bytes + 15) // 16
+        counts['aes_calls'] += aes_calls
+        counts['seconds'] += seconds
+
+    def as_dict(self):
+        """A copy of the counts, keyed by stage, for exporting."""
+        return {stage: dict(counts) for stage, counts in self.stages.items()}
+
+
+# Where stages are recorded while instrument is active, else None.
+_stats = None
+
 
+@contextmanager
+def instrument(stats=None):
+    """Record every GCMContext stage run inside the with block.
 
-def incr(counter_block):
-    """Returns int(counter_block) + 1, holding the first four bytes constant."""
-    return (counter_block[:-4] + ((int.from_bytes(counter_block[-4:], 'big') + 1
-                                   ) % 2**(8*4)).to_bytes(4, 'big'))
+    Yields stats, a new GCMStats by default. Anything else with a
+    record(stage, seconds, n_bytes, aes_calls) method works too, which
+    makes a hook for passing stages straight on somewhere else.
+    Recording is for the whole process, not just this thread. With no
+    instrument active, each stage costs one extra function call.
+    """
+    global _stats
+    if stats is None:
+        stats = GCMStats()
+    previous, _stats = _stats, stats
+    try:
+        yield stats
+    finally:
+        _stats = previous
+
+
+def _stage(stage, n_bytes, aes_calls, func, *args):
+    """func(*args), recorded against stage if instrument is active."""
+    if _stats is None:
+        return func(*args)
+    start = perf_counter()
+    result = func(*args)
+    _stats.record(stage, perf_counter() - start, n_bytes, aes_calls)
+    return result
+
+
+def incr(counter_block, step=1):
+    """Returns int(counter_block) + step, holding the first 12 bytes constant.
+
+    The last four bytes wrap around mod 2^32.
+    """
+    return (counter_block[:-4] + ((int.from_bytes(counter_block[-4:], 'big')
+                                   + step) % 2**(8*4)).to_bytes(4, 'big'))
+
+
+def counter_blocks(counter_block, n):
+    """n successive counter blocks starting at counter_block, as one bytes.
+
+    Same as joining counter_block, incr(counter_block), ... but the
+    counters are packed in one go and interleaved with the constant
+    first 12 bytes by strided slice assignment.
+    """
+    start = int.from_bytes(counter_block[-4:], 'big')
+    before_wrap = min(n, 2**32 - start)
+    counters = struct.pack('>{0}I'.format(n),
+                           *range(start, start + before_wrap),
+                           *range(n - before_wrap))
+    buffer = bytearray(16*n)
+    for i in range(12):
+        buffer[i::16] = counter_block[i:i+1] * n
+    for i in range(4):
+        buffer[12+i::16] = counters[i::4]
+    return bytes(buffer)
 
 
 def xor(bytes1, bytes2):
-    """xor two strings of bytes, dropping bytes from the end of the longer."""
-    return bytes([b1 ^ b2 for (b1, b2) in zip(bytes1, bytes2)])
+    """xor two strings of bytes, dropping bytes from the end of the longer.
+
+    Does the whole span in one go by treating each string as one big int.
+    """
+    n = min(len(bytes1), len(bytes2))
+    if len(bytes1) != n:
+        bytes1 = bytes1[:n]
+    if len(bytes2) != n:
+        bytes2 = bytes2[:n]
+    return (int.from_bytes(bytes1, 'big')
+            ^ int.from_bytes(bytes2, 'big')).to_bytes(n, 'big')
 
 
 def gcm_pad(assoc_data, cipher):
@@ -22,12 +133,37 @@ def gcm_pad(assoc_data, cipher):
             + (len(cipher)*8).to_bytes(8, 'big'))
 
 
+GHASH_TABLE_MIN_BLOCKS = 64
+
+
+@lru_cache(maxsize=16)
+def ghash_table(subkey):
+    """Multiplication tables for subkey, kept for reuse under the same key."""
+    return GHASHTable(subkey)
+
+
 def GHASH(subkey, bytes_string):
-    """Calculates Galois hash polynomial per NIST 800-38D."""
-    if len(bytes_string) % 16 != 0:
-        raise ValueError("Input bytes_string length must be"
-                         "an even multiple of 16, not {0}"
-                         .format(len(bytes_string)))
+    """Calculates Galois hash polynomial per NIST 800-38D.
+
+    Works on plain ints in GCM's bit order, see ghash.py. Short inputs
+    skip the tables, which cost about as much to build as hashing
+    GHASH_TABLE_MIN_BLOCKS blocks without them.
+    GHASH_reference is the same calculation written with field objects.
+    """
+    return _ghash_updater(subkey, len(bytes_string))(
+        0, bytes_string).to_bytes(16, 'big')
+
+
+def _ghash_updater(subkey, length):
+    """The quicker GHASH update(y, bytes_string) for length bytes."""
+    if length >= 16*GHASH_TABLE_MIN_BLOCKS:
+        return ghash_table(subkey).update
+    return partial(ghash_update, int.from_bytes(subkey, 'big'))
+
+
+def GHASH_reference(subkey, bytes_string):
+    """Calculates Galois hash polynomial per NIST 800-38D, using GF2_128."""
+    check_blocks(bytes_string)
     # Split bytes_string into 16-byte blocks.
     blocks = [bytes_string[i:i+16] for i in range(0, len(bytes_string), 16)]
     # Convert bytes key to field element.
@@ -39,22 +175,30 @@ def GHASH(subkey, bytes_string):
     return g.toBytes()
 
 
-def GCTR(key, initial_counter_block, bytes_string):
-    """Counter mode AES cipher per NIST 800-38D."""
+def gctr(encryptor, initial_counter_block, bytes_string):
+    """GCTR using an AES-ECB encryptor that has already been set up."""
     if len(bytes_string) == 0:
         return bytes_string
-    # Split bytes_string into 16-byte blocks.
-    blocks = [bytes_string[i:i + 16] for i in range(0, len(bytes_string), 16)]
-    out_blocks = []
+    # Encrypt counter blocks GCTR_CHUNK_BLOCKS at a time in one AES call,
+    # rather than going back to AES for every block.
+    out_chunks = []
     counter_block = initial_counter_block
-    for block in blocks:
-        out_blocks.append(xor(block, encrypt_block(key, counter_block)))
-        counter_block = incr(counter_block)
-    return b''.join(out_blocks)
+    for i in range(0, len(bytes_string), 16*GCTR_CHUNK_BLOCKS):
+        chunk = bytes_string[i:i + 16*GCTR_CHUNK_BLOCKS]
+        n = (len(chunk) + 15) // 16
+        keystream = encryptor.update(counter_blocks(counter_block, n))
+        out_chunks.append(xor(chunk, keystream))
+        counter_block = incr(counter_block, n)
+    return b''.join(out_chunks)
 
 
-def GCM_AE(key, initial_value, plain_text, assoc_data, tag_length=16):
-    """GCM authenticated encryption per NIST 800-38D. HAZMAT!"""
+def GCTR(key, initial_counter_block, bytes_string):
+    """Counter mode AES cipher per NIST 800-38D."""
+    return gctr(ecb_encryptor(key), initial_counter_block, bytes_string)
+
+
+def check_AE_arguments(initial_value, plain_text, assoc_data, tag_length):
+    """Raise ValueError if GCM_AE arguments break NIST's constraints."""
     if len(plain_text) > const.PLAINTEXT_MAX_LENGTH:
         raise ValueError("Plaintext exceeds max length {0} bytes"
                          .format(const.PLAINTEXT_MAX_LENGTH))
@@ -69,40 +213,330 @@ def GCM_AE(key, initial_value, plain_text, assoc_data, tag_length=16):
                          .format(const.IV_MAX_LENGTH))
     if tag_length not in const.PERMITTED_TAG_LENGTHS:
         raise ValueError("Tag length {0} bytes not allowed.".format(tag_length))
-    subkey = encrypt_block(key, bytes([0]*16))
-    if len(initial_value) == 12:
-        nonce_block = initial_value + int(1).to_bytes(4, 'big')
-    else:
-        pad_len = (16 - len(initial_value)) % 16
-        nonce_block = GHASH(subkey, initial_value
-                            + bytes([0]*(pad_len+8))
-                            + len(initial_value).to_bytes(8, 'big'))
-    cipher = GCTR(key, incr(nonce_block), plain_text)
-    hash_block = GHASH(subkey, gcm_pad(assoc_data, cipher))
-    return cipher, GCTR(key, nonce_block, hash_block)[:tag_length]
+
+
+def AD_arguments_valid(initial_value, cipher, assoc_data, tag, tag_length):
+    """Whether GCM_AD arguments keep to NIST's constraints.
+
+    No details, since GCM_AD only ever fails with a generic error. The
+    tag has to be bytes-like too, as compare_digest raises TypeError for
+    anything else rather than returning False.
+    """
+    return (isinstance(tag, (bytes, bytearray, memoryview))
+            and len(tag) == tag_length
+            and len(cipher) <= const.PLAINTEXT_MAX_LENGTH
+            and len(assoc_data) <= const.ASSOC_DATA_MAX_LENGTH
+            and const.IV_MIN_LENGTH <= len(initial_value) <= const.IV_MAX_LENGTH
+            and tag_length in const.PERMITTED_TAG_LENGTHS)
+
+
+def GCM_AE(key, initial_value, plain_text, assoc_data, tag_length=16):
+    """GCM authenticated encryption per NIST 800-38D. HAZMAT!"""
+    return GCMContext(key, precompute=False).GCM_AE(
+        initial_value, plain_text, assoc_data, tag_length)
 
 
 def GCM_AD(key, initial_value, cipher, assoc_data, tag, tag_length=16):
     """GCM authenticated decryption mode per NIST 800-38D."""
-    if (len(tag) != tag_length
-        or len(cipher) > const.PLAINTEXT_MAX_LENGTH
-        or len(assoc_data) > const.ASSOC_DATA_MAX_LENGTH
-        or len(initial_value) < const.IV_MIN_LENGTH
-        or len(initial_value) > const.IV_MAX_LENGTH
-        or tag_length not in const.PERMITTED_TAG_LENGTHS):
-            raise ValueError("Could not validate message with supplied tag.")
-    subkey = encrypt_block(key, bytes([0] * 16))
+    return GCMContext(key, precompute=False).GCM_AD(
+        initial_value, cipher, assoc_data, tag, tag_length)
+
+
+def verify_only(key, initial_value, cipher, assoc_data, tag, tag_length=16):
+    """Check a GCM tag without decrypting. Returns True or False."""
+    return GCMContext(key, precompute=False).verify_only(
+        initial_value, cipher, assoc_data, tag, tag_length)
+
+
+def _gmac_hash(update, data):
+    """GHASH of data as associated data with no ciphertext, as an int.
+
+    update is a GHASH update for the subkey. The full blocks are hashed
+    straight out of data, and only a partial last block is copied out
+    to be padded.
+    """
+    data = memoryview(data)
+    full = len(data) - len(data) % 16
+    y = update(0, data[:full])
+    if full < len(data):
+        y = update(y, bytes(data[full:]) + bytes(16 - len(data) + full))
+    return update(y, (len(data)*8).to_bytes(8, 'big') + bytes(8))
+
+
+def gmac(key, initial_value, data, tag_length=16):
+    """GMAC per NIST 800-38D, authentication of data only. HAZMAT!
+
+    The same tag as GCM_AE(key, initial_value, b'', data), without
+    padding data into a new buffer first. With a 12 byte IV, H and the
+    mask for the tag come out of a single AES call.
+    """
+    check_AE_arguments(initial_value, b'', data, tag_length)
     if len(initial_value) == 12:
-        nonce_block = initial_value + int(1).to_bytes(4, 'big')
+        blocks = ecb_encryptor(key).update(
+            bytes(16) + initial_value + int(1).to_bytes(4, 'big'))
+        subkey, mask = blocks[:16], blocks[16:]
     else:
+        # J0 is a GHASH under H, so H has to come first.
+        context = GCMContext(key, precompute=False)
+        subkey = context.subkey
+        mask = context.encryptor.update(
+            context.pre_counter_block(initial_value))
+    y = _gmac_hash(_ghash_updater(subkey, len(data)), data)
+    return xor(mask, y.to_bytes(16, 'big'))[:tag_length]
+
+
+def gmac_verify(key, initial_value, data, tag, tag_length=16):
+    """Check a GMAC tag. Returns True or False."""
+    return (AD_arguments_valid(initial_value, b'', data, tag, tag_length)
+            and compare_digest(tag, gmac(key, initial_value, data,
+                                         tag_length)))
+
+
+class GCMContext:
+    """AES-GCM-128 with the per-key state worked out once and kept.
+
+    Holds the AES encryptor, the hash subkey H and its GHASH tables, so
+    that encrypting or decrypting a message only costs that message's
+    blocks. Worth it as soon as a key is used for more than a handful of
+    messages. GCM_AE and GCM_AD make a throwaway one with
+    precompute=False, which skips the tables for short messages.
+
+    Not safe to share between threads: the AES encryptor is stateful.
+
+    Args:
+        key (bytes): 16 byte encryption key value.
+        precompute (bool): build GHASH tables for the subkey up front.
+        ghash (str): what to precompute, 'table' for GHASHTable, or
+            'aggregated' for AggregatedGHASH, which is quicker to set up
+            but slower per block.
+        n (int): blocks per reduction, for ghash='aggregated'.
+    """
+    def __init__(self, key, precompute=True, ghash='table', n=8):
+        if ghash not in ('table', 'aggregated'):
+            raise ValueError("GHASH must be 'table' or 'aggregated', not {0!r}"
+                             .format(ghash))
+        self.encryptor = ecb_encryptor(key)
+        self.subkey = _stage('subkey', 16, 1, self.encryptor.update,
+                             bytes([0]*16))
+        # ghash maps bytes to bytes, ghash_update continues a GHASH from an
+        # int accumulator, for callers that feed data in a piece at a time.
+        if precompute:
+            if ghash == 'table':
+                table = GHASHTable(self.subkey)
+            else:
+                table = AggregatedGHASH(self.subkey, n)
+            self.ghash, self.ghash_update = table.digest, table.update
+        else:
+            self.ghash = partial(GHASH, self.subkey)
+            self.ghash_update = partial(ghash_update,
+                                        int.from_bytes(self.subkey, 'big'))
+
+    def gctr(self, initial_counter_block, bytes_string):
+        """GCTR under this context's key."""
+        aes_calls = -(-len(bytes_string) // (16*GCTR_CHUNK_BLOCKS))
+        return _stage('gctr', len(bytes_string), aes_calls, gctr,
+                      self.encryptor, initial_counter_block, bytes_string)
+
+    def _pad_and_hash(self, assoc_data, cipher):
+        """GHASH of gcm_pad(assoc_data, cipher), the tag before masking."""
+        padded = _stage('padding', len(assoc_data) + len(cipher), 0, gcm_pad,
+                        assoc_data, cipher)
+        return _stage('tag_ghash', len(padded), 0, self.ghash, padded)
+
+    def pre_counter_block(self, initial_value):
+        """Derive the pre-counter block J0 from the IV."""
+        if len(initial_value) == 12:
+            return initial_value + int(1).to_bytes(4, 'big')
         pad_len = (16 - len(initial_value)) % 16
-        nonce_block = GHASH(subkey, initial_value
-                            + bytes([0] * (pad_len + 8))
-                            + len(initial_value).to_bytes(8, 'big'))
-    plain_text = GCTR(key, incr(nonce_block), cipher)
-    hash_block = GHASH(subkey, gcm_pad(assoc_data, cipher))
-    derived_tag = GCTR(key, nonce_block, hash_block)[:tag_length]
-    if tag == derived_tag:
-        return plain_text, assoc_data
-    else:
-        raise ValueError("Could not validate message with supplied tag.")
+        padded = (initial_value + bytes([0]*(pad_len+8))
+                  + (len(initial_value)*8).to_bytes(8, 'big'))
+        return _stage('iv_ghash', len(padded), 0, self.ghash, padded)
+
+    def GCM_AE(self, initial_value, plain_text, assoc_data, tag_length=16):
+        """GCM authenticated encryption per NIST 800-38D. HAZMAT!"""
+        check_AE_arguments(initial_value, plain_text, assoc_data, tag_length)
+        nonce_block = self.pre_counter_block(initial_value)
+        cipher = self.gctr(incr(nonce_block), plain_text)
+        hash_block = self._pad_and_hash(assoc_data, cipher)
+        return cipher, self.gctr(nonce_block, hash_block)[:tag_length]
+
+    def tag_matches(self, nonce_block, cipher, assoc_data, tag, tag_length):
+        """Whether tag authenticates cipher and assoc_data.
+
+        Compares in constant time, so as not to leak how much of a forged
+        tag was right.
+        """
+        hash_block = self._pad_and_hash(assoc_data, cipher)
+        derived_tag = self.gctr(nonce_block, hash_block)[:tag_length]
+        return compare_digest(tag, derived_tag)
+
+    def verify_only(self, initial_value, cipher, assoc_data, tag,
+                    tag_length=16):
+        """Whether tag authenticates cipher and assoc_data. No decryption."""
+        return (AD_arguments_valid(initial_value, cipher, assoc_data, tag,
+                                   tag_length)
+                and self.tag_matches(self.pre_counter_block(initial_value),
+                                     cipher, assoc_data, tag, tag_length))
+
+    def gmac(self, initial_value, data, tag_length=16):
+        """GMAC under this context's key, see gmac. HAZMAT!"""
+        check_AE_arguments(initial_value, b'', data, tag_length)
+        mask = self.encryptor.update(self.pre_counter_block(initial_value))
+        y = _gmac_hash(self.ghash_update, data)
+        return xor(mask, y.to_bytes(16, 'big'))[:tag_length]
+
+    def gmac_verify(self, initial_value, data, tag, tag_length=16):
+        """Check a GMAC tag under this context's key. True or False."""
+        return (AD_arguments_valid(initial_value, b'', data, tag, tag_length)
+                and compare_digest(tag, self.gmac(initial_value, data,
+                                                  tag_length)))
+
+    def GCM_AD(self, initial_value, cipher, assoc_data, tag, tag_length=16):
+        """GCM authenticated decryption mode per NIST 800-38D.
+
+        Checks the tag before decrypting, so a forged message is turned
+        away without generating any keystream for it.
+        """
+        if not AD_arguments_valid(initial_value, cipher, assoc_data, tag,
+                                  tag_length):
+            raise ValueError("Could not validate message with supplied tag.")
+        nonce_block = self.pre_counter_block(initial_value)
+        if not self.tag_matches(nonce_block, cipher, assoc_data, tag,
+                                tag_length):
+            raise ValueError("Could not validate message with supplied tag.")
+        return self.gctr(incr(nonce_block), cipher), assoc_data
+
+    def encrypt(self, plaintext, assoc_data, encoding='utf-8'):
+        """Authenticated encryption under this key with a random IV.
+
+        Same as main.encrypt, without the key argument.
+
+        Returns:
+            (cipher, assoc_data, tag, iv) (tuple of bytes objects)
+        """
+        plaintext = as_bytes(plaintext, encoding, "Plaintext")
+        if len(plaintext) > const.PLAINTEXT_MAX_LENGTH:
+            raise ValueError("Plaintext exceeds max length {0} bytes"
+                             .format(const.PLAINTEXT_MAX_LENGTH))
+        assoc_data = as_bytes(assoc_data, encoding, "Associated data")
+        if len(assoc_data) > const.ASSOC_DATA_MAX_LENGTH:
+            raise ValueError("Associated data exceeds max length {0} bytes."
+                             .format(const.ASSOC_DATA_MAX_LENGTH))
+        iv = urandom(12)
+        cipher, tag = self.GCM_AE(iv, plaintext, assoc_data, 16)
+        return cipher, assoc_data, tag, iv
+
+    def decrypt(self, cipher, assoc_data, iv, tag):
+        """Authenticated decryption under this key.
+
+        Same as main.decrypt, without the key argument: returns
+        (plaintext, assoc_data) or raises a generic ValueError.
+        """
+        try:
+            return self.GCM_AD(iv, cipher, assoc_data, tag, 16)
+        except Exception as e:
+            raise ValueError("Could not validate message with supplied tag.")
+
+    def _bulk_keystream(self, nonce_blocks, lengths):
+        """Tag mask and keystream for each of many messages, in one AES call.
+
+        Message i needs its pre-counter block for the tag and then
+        lengths[i] bytes of keystream from the block after, which is
+        just counter_blocks(nonce_blocks[i], 1 + blocks) all joined up.
+        """
+        block_counts = [(length + 15) // 16 for length in lengths]
+        counters = b''.join(counter_blocks(nonce_block, 1 + n)
+                            for (nonce_block, n)
+                            in zip(nonce_blocks, block_counts))
+        keystream = _stage('gctr', len(counters), 1, self.encryptor.update,
+                           counters)
+        out, i = [], 0
+        for length, n in zip(lengths, block_counts):
+            out.append((keystream[i:i+16], keystream[i+16:i+16+length]))
+            i += 16*(1 + n)
+        return out
+
+    def encrypt_many(self, items, encoding='utf-8'):
+        """encrypt for a batch of (plaintext, assoc_data) pairs.
+
+        The IVs come from one os.urandom call and the keystream for the
+        whole batch from one AES call, which is most of the per-message
+        overhead for small messages.
+
+        Returns:
+            list of (cipher, assoc_data, tag, iv) tuples, in order.
+        """
+        plaintexts, assoc_datas = [], []
+        for plaintext, assoc_data in items:
+            plaintext = as_bytes(plaintext, encoding, "Plaintext")
+            assoc_data = as_bytes(assoc_data, encoding, "Associated data")
+            check_AE_arguments(bytes(12), plaintext, assoc_data, 16)
+            plaintexts.append(plaintext)
+            assoc_datas.append(assoc_data)
+        ivs = urandom(12*len(plaintexts))
+        ivs = [ivs[i:i+12] for i in range(0, len(ivs), 12)]
+        keystreams = self._bulk_keystream(
+            [self.pre_counter_block(iv) for iv in ivs],
+            [len(plaintext) for plaintext in plaintexts])
+        results = []
+        for plaintext, assoc_data, iv, (mask, keystream) in zip(
+                plaintexts, assoc_datas, ivs, keystreams):
+            cipher = xor(plaintext, keystream)
+            tag = xor(mask, self._pad_and_hash(assoc_data, cipher))
+            results.append((cipher, assoc_data, tag, iv))
+        return results
+
+    def decrypt_many(self, items, strict=False):
+        """decrypt for a batch of (cipher, assoc_data, iv, tag) tuples.
+
+        All of the batch is authenticated before any of it is decrypted.
+        The tag masks for the whole batch come from one AES call, and
+        the keystream for the messages that passed from one more. A
+        message that can't be validated doesn't stop the rest, unless
+        strict is set.
+
+        Args:
+            items (iterable): (cipher, assoc_data, iv, tag) tuples.
+            strict (bool): all or nothing, raising a ValueError naming
+                the index of the first message that can't be validated.
+
+        Returns:
+            list with (plaintext, assoc_data) for each message, in order,
+            or the generic ValueError for one that couldn't be validated.
+        """
+        items = list(items)
+        results, candidates, nonce_blocks = [None] * len(items), [], []
+        for i, item in enumerate(items):
+            try:
+                cipher, assoc_data, iv, tag = item
+                if AD_arguments_valid(iv, cipher, assoc_data, tag, 16):
+                    nonce_blocks.append(self.pre_counter_block(iv))
+                    candidates.append(i)
+            except Exception:
+                pass
+        joined = b''.join(nonce_blocks)
+        masks = (_stage('gctr', len(joined), 1, self.encryptor.update, joined)
+                 if joined else b'')
+        valid, counters = [], []
+        for j, (i, nonce_block) in enumerate(zip(candidates, nonce_blocks)):
+            cipher, assoc_data, _, tag = items[i]
+            hash_block = self._pad_and_hash(assoc_data, cipher)
+            if compare_digest(tag, xor(masks[16*j:16*j + 16], hash_block)):
+                valid.append(i)
+                counters.append(counter_blocks(incr(nonce_block),
+                                               (len(cipher) + 15) // 16))
+        if strict and len(valid) < len(items):
+            first = min(set(range(len(items))) - set(valid))
+            raise ValueError("Could not validate message {0} with supplied "
+                             "tag.".format(first))
+        joined = b''.join(counters)
+        keystream = (_stage('gctr', len(joined), 1, self.encryptor.update,
+                            joined) if joined else b'')
+        offset = 0
+        for i in valid:
+            cipher, assoc_data, _, _ = items[i]
+            results[i] = (xor(cipher, keystream[offset:offset + len(cipher)]),
+                          assoc_data)
+            offset += 16*((len(cipher) + 15) // 16)
+        return [ValueError("Could not validate message with supplied tag.")
+                if result is None else result for result in results]
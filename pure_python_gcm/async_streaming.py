@@ -0,0 +1,125 @@
+"""AES-GCM-128 between asyncio streams, without blocking the event loop.
+
+encrypt_stream reads plaintext from an asyncio.StreamReader and writes
+IV + ciphertext + tag to a StreamWriter, the same layout as files.py,
+and decrypt_stream undoes it. Data goes through GCMEncryptor and
+GCMDecryptor a chunk at a time, and each chunk is worked on in an
+executor while the next one is read, so the loop is free to serve other
+connections in the meantime. The writer is drained after every chunk,
+so a slow reader on the other end slows us down rather than filling up
+memory: there are never more than two chunks in hand.
+
+The default executor is the loop's thread pool. The work is pure Python
+and holds the GIL, but the interpreter hands the GIL back and forth
+every few milliseconds (sys.getswitchinterval), which bounds how long
+the loop waits. A process pool can't be used, as the stream state has
+to stay in one place.
+"""
+import asyncio
+from os import urandom
+
+from pure_python_gcm.files import IV_LENGTH, TAG_LENGTH
+from pure_python_gcm.streaming import GCMDecryptor, GCMEncryptor
+
+# Bytes handed to the executor at a time. About 10 ms of work.
+CHUNK_SIZE = 2**16
+
+
+async def _read_chunk(reader, chunk_size):
+    """Read chunk_size bytes, or fewer only at the end of the stream."""
+    try:
+        return await reader.readexactly(chunk_size)
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+
+
+async def _pipeline(crypter, reader, writer, chunk_size, executor, split):
+    """Feed reader through crypter.update to writer, a chunk at a time.
+
+    split(chunk) gives the part of each chunk to pass on now. Returns
+    the number of bytes passed on.
+    """
+    loop = asyncio.get_running_loop()
+    length = 0
+    chunk = await _read_chunk(reader, chunk_size)
+    while chunk:
+        data = split(chunk)
+        pending = loop.run_in_executor(executor, crypter.update, data)
+        # Read the next chunk while this one is being worked on.
+        chunk = await _read_chunk(reader, chunk_size)
+        writer.write(await pending)
+        await writer.drain()
+        length += len(data)
+    return length
+
+
+async def encrypt_stream(key, reader, writer, assoc_data=b'',
+                         chunk_size=CHUNK_SIZE, executor=None):
+    """Encrypt everything from reader to writer, with a random IV.
+
+    Args:
+        key (bytes or GCMContext): 16 byte key, or context for the key,
+            which mustn't be in use anywhere else at the same time.
+        reader (asyncio.StreamReader): plaintext, read until EOF.
+        writer (asyncio.StreamWriter): gets IV + ciphertext + tag.
+            Left open.
+        assoc_data (bytes): additional data to authenticate.
+        chunk_size (int): bytes to work on at a time.
+        executor (concurrent.futures.Executor or None): where to do the
+            work, None for the loop's default.
+
+    Returns:
+        length of the plaintext, in bytes.
+    """
+    loop = asyncio.get_running_loop()
+    iv = urandom(IV_LENGTH)
+    encryptor = await loop.run_in_executor(executor, GCMEncryptor, key, iv,
+                                           TAG_LENGTH)
+    await loop.run_in_executor(executor, encryptor.update_aad, assoc_data)
+    writer.write(iv)
+    length = await _pipeline(encryptor, reader, writer, chunk_size, executor,
+                             lambda chunk: chunk)
+    encryptor.finalize()
+    writer.write(encryptor.tag)
+    await writer.drain()
+    return length
+
+
+async def decrypt_stream(key, reader, writer, assoc_data=b'',
+                         chunk_size=CHUNK_SIZE, executor=None):
+    """Decrypt what encrypt_stream wrote, from reader to writer. HAZMAT!
+
+    Plaintext is written as it is decrypted, before the tag at the end
+    of the stream has been checked, so nothing written can be trusted
+    until this returns. If it raises the generic ValueError, everything
+    written has to be thrown away, and the connection should be dropped.
+    Arguments are as for encrypt_stream.
+
+    Returns:
+        length of the plaintext, in bytes.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        iv = await reader.readexactly(IV_LENGTH)
+    except asyncio.IncompleteReadError:
+        raise ValueError("Could not validate message with supplied tag.")
+    decryptor = await loop.run_in_executor(executor, GCMDecryptor, key, iv,
+                                           None, TAG_LENGTH)
+    await loop.run_in_executor(executor, decryptor.update_aad, assoc_data)
+    # The tag is the last TAG_LENGTH bytes, so those are always held
+    # back from the decryptor until we know there's more after them.
+    held = b''
+
+    def split(chunk):
+        nonlocal held
+        data = held + chunk
+        cut = max(0, len(data) - TAG_LENGTH)
+        held = data[cut:]
+        return data[:cut]
+
+    length = await _pipeline(decryptor, reader, writer, chunk_size, executor,
+                             split)
+    if len(held) < TAG_LENGTH:
+        raise ValueError("Could not validate message with supplied tag.")
+    decryptor.finalize_with_tag(held)
+    return length
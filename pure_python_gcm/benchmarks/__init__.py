@@ -0,0 +1,36 @@
+"""Timing and memory benchmarks, run as scripts with python -m."""
+import timeit
+import tracemalloc
+
+
+def best_time(func, number, repeat=5):
+    """Best time per call of func over repeat runs of number calls, in s."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def allocated_per_item(make_items, count):
+    """Bytes of memory allocated per item by make_items(count)."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        items = make_items(count)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del items
+    return (after - before) / count
+
+
+def peak_allocated(func):
+    """Peak memory allocated during one call of func, in bytes.
+
+    Only allocations made after tracing starts count, so the arguments
+    func closes over don't.
+    """
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
@@ -0,0 +1,62 @@
+"""Per-operation cost and size of field elements.
+
+Compares the slot-based classes against the same classes with a
+__dict__ (by subclassing without __slots__), and the trusted
+constructor against the checked one.
+
+    python -m pure_python_gcm.benchmarks.elements
+"""
+from pure_python_gcm.benchmarks import allocated_per_item, best_time
+from pure_python_gcm.gf2_polynomials import PolynomialGF2
+from pure_python_gcm.gf2k import GF2kElement
+from pure_python_gcm.gf2k.defined_fields import GF2_128
+
+
+class DictPolynomialGF2(PolynomialGF2):
+    """PolynomialGF2 with a __dict__, as it was before __slots__."""
+
+
+class DictGF2kElement(GF2kElement):
+    """GF2kElement with a __dict__, as it was before __slots__."""
+
+
+def main():
+    a, b = GF2_128.getRandomElement(), GF2_128.getRandomElement()
+    bitrep = a.poly.bitrep
+    print("{0:<44}{1:>10}".format("operation", "us/op"))
+    for name, func, number in [
+            ("element + element", lambda: a + b, 20000),
+            ("element * element", lambda: a * b, 1000),
+            ("element ** (2**128 - 2)", lambda: a ** (2**128 - 2), 20),
+            ("~element, Itoh-Tsujii",
+             lambda: GF2_128.invertItohTsujii(a.poly), 100),
+            ("~element, extended Euclidean",
+             lambda: GF2_128.invertEuclidean(a.poly), 100),
+            ("GF2kElement(int, field), checked",
+             lambda: GF2kElement(bitrep, GF2_128), 20000),
+            ("GF2kElement.fromTrustedPoly",
+             lambda: GF2kElement.fromTrustedPoly(a.poly, GF2_128), 20000),
+            ("GF2_128.getElement(0), interned",
+             lambda: GF2_128.getElement(0), 20000)]:
+        print("{0:<44}{1:>10.3f}".format(name, best_time(func, number)*1e6))
+    print()
+    print("{0:<44}{1:>10}".format("object", "bytes"))
+    count = 10000
+    for name, make in [
+            ("PolynomialGF2, slots", lambda n: [
+                PolynomialGF2(bitrep ^ i) for i in range(n)]),
+            ("PolynomialGF2, dict", lambda n: [
+                DictPolynomialGF2(bitrep ^ i) for i in range(n)]),
+            ("GF2kElement, slots", lambda n: [
+                GF2kElement.fromTrustedPoly(PolynomialGF2(bitrep ^ i),
+                                            GF2_128) for i in range(n)]),
+            ("GF2kElement, dict", lambda n: [
+                DictGF2kElement.fromTrustedPoly(DictPolynomialGF2(bitrep ^ i),
+                                                GF2_128)
+                for i in range(n)])]:
+        print("{0:<44}{1:>10.1f}".format(name, allocated_per_item(make,
+                                                                  count)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Throughput and memory of AES-GCM, against cryptography's AESGCM.
+
+Times GCM_AE and GCM_AD with 96 bit and long IVs, and GHASH and GCTR on
+their own, at message sizes from 0 B to 16 MB. cryptography's AESGCM,
+which is C, does the same encryptions and decryptions as a ceiling.
+Each result has the time per call, the throughput and the peak memory
+allocated during one call, and they're all written out as JSON so that
+runs from different versions can be compared with --compare.
+
+Calls are repeated under the same key, so the GHASH tables cached per
+subkey are only built by the first one, as in steady use.
+
+    python -m pure_python_gcm.benchmarks.gcm [--max-size BYTES]
+        [--output FILE] [--compare OLD_FILE]
+"""
+import argparse
+import json
+import platform
+import time
+from functools import partial
+from os import urandom
+
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from pure_python_gcm.aes_gcm_128 import GCM_AD, GCM_AE, GCTR, GHASH, gcm_pad
+from pure_python_gcm.benchmarks import best_time, peak_allocated
+
+SIZES = [0, 64, 1024, 2**16, 2**20, 2**24]
+# 12 byte IVs are used as they are, any other length goes through GHASH.
+IV_LENGTHS = [12, 64]
+# Roughly how long to spend timing each case, in seconds.
+TARGET_TIME = 0.5
+
+
+def measure(func, size):
+    """Time per call, throughput and peak memory of func, as a dict."""
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    if once >= TARGET_TIME:
+        seconds = once
+    else:
+        seconds = best_time(func, max(1, int(TARGET_TIME / (3*once))), 3)
+    return {'us_per_op': seconds * 1e6,
+            'mb_per_s': size / seconds / 1e6 if size else None,
+            'peak_bytes': peak_allocated(func)}
+
+
+def cases(size):
+    """(operation, implementation, iv_length, func) for one message size."""
+    key, data = urandom(16), urandom(size)
+    aesgcm = AESGCM(key)
+    for iv_length in IV_LENGTHS:
+        iv = urandom(iv_length)
+        cipher, tag = GCM_AE(key, iv, data, b'')
+        sealed = aesgcm.encrypt(iv, data, None)
+        yield ('encrypt', 'pure_python_gcm', iv_length,
+               partial(GCM_AE, key, iv, data, b''))
+        yield ('decrypt', 'pure_python_gcm', iv_length,
+               partial(GCM_AD, key, iv, cipher, b'', tag))
+        yield ('encrypt', 'cryptography', iv_length,
+               partial(aesgcm.encrypt, iv, data, None))
+        yield ('decrypt', 'cryptography', iv_length,
+               partial(aesgcm.decrypt, iv, sealed, None))
+    yield ('GHASH', 'pure_python_gcm', None,
+           partial(GHASH, urandom(16), gcm_pad(b'', data)))
+    yield ('GCTR', 'pure_python_gcm', None,
+           partial(GCTR, key, urandom(16), data))
+
+
+def run(sizes):
+    """Measure every case at every size, printing as we go."""
+    results = []
+    print("{0:<10}{1:<17}{2:>10}{3:>5}{4:>14}{5:>10}{6:>12}".format(
+        "operation", "implementation", "bytes", "iv", "us/op", "MB/s",
+        "peak KB"))
+    for size in sizes:
+        for operation, implementation, iv_length, func in cases(size):
+            result = {'operation': operation,
+                      'implementation': implementation,
+                      'size': size, 'iv_length': iv_length}
+            result.update(measure(func, size))
+            results.append(result)
+            print("{0:<10}{1:<17}{2:>10}{3:>5}{4:>14.1f}{5:>10}{6:>12.1f}"
+                  .format(operation, implementation, size,
+                          iv_length or '-', result['us_per_op'],
+                          '-' if result['mb_per_s'] is None
+                          else '{0:.2f}'.format(result['mb_per_s']),
+                          result['peak_bytes'] / 1024))
+    return results
+
+
+def _case_key(result):
+    return (result['operation'], result['implementation'], result['size'],
+            result['iv_length'])
+
+
+def compare(results, old_results):
+    """Print the time per call of each case relative to an older run."""
+    old = {_case_key(result): result for result in old_results}
+    print()
+    print("{0:<10}{1:<17}{2:>10}{3:>5}{4:>14}".format(
+        "operation", "implementation", "bytes", "iv", "time vs old"))
+    for result in results:
+        before = old.get(_case_key(result))
+        if before is not None:
+            print("{0:<10}{1:<17}{2:>10}{3:>5}{4:>13.2f}x".format(
+                result['operation'], result['implementation'],
+                result['size'], result['iv_length'] or '-',
+                result['us_per_op'] / before['us_per_op']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m pure_python_gcm.benchmarks.gcm',
+        description="Benchmark AES-GCM and write the results as JSON.")
+    parser.add_argument('--max-size', type=int, default=max(SIZES),
+                        help="largest message size to run, in bytes")
+    parser.add_argument('--output', default='gcm_benchmark.json',
+                        help="file to write the results to")
+    parser.add_argument('--compare', metavar='OLD_FILE',
+                        help="results of an earlier run to compare with")
+    args = parser.parse_args(argv)
+    results = run([size for size in SIZES if size <= args.max_size])
+    with open(args.output, 'w') as f:
+        json.dump({'python': platform.python_version(),
+                   'platform': platform.platform(),
+                   'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                   'results': results}, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)['results'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""GMAC against the GCM_AE route to the same tag.
+
+Times gmac(key, iv, data) and GCM_AE(key, iv, b'', data) for growing
+amounts of associated data, with both a new key every call and a
+GCMContext kept for the key, and the peak memory of each.
+
+    python -m pure_python_gcm.benchmarks.gmac
+"""
+from os import urandom
+
+from pure_python_gcm.aes_gcm_128 import GCM_AE, GCMContext, gmac
+from pure_python_gcm.benchmarks import best_time, peak_allocated
+
+SIZES = [0, 64, 1024, 2**16, 2**20]
+
+
+def main():
+    key, iv = urandom(16), urandom(12)
+    context = GCMContext(key)
+    print("{0:>9}{1:>14}{2:>14}{3:>14}{4:>14}{5:>12}{6:>12}".format(
+        "bytes", "gmac", "GCM_AE", "ctx.gmac", "ctx.GCM_AE", "gmac KB",
+        "GCM_AE KB"))
+    for size in SIZES:
+        data = urandom(size)
+        cases = [lambda: gmac(key, iv, data),
+                 lambda: GCM_AE(key, iv, b'', data),
+                 lambda: context.gmac(iv, data),
+                 lambda: context.GCM_AE(iv, b'', data)]
+        number = max(3, 2**16 // (size + 64))
+        times = [best_time(case, number, 3) for case in cases]
+        peaks = [peak_allocated(case) for case in cases[:2]]
+        print(("{:>9}" + "{:>12.1f}us" * 4 + "{:>12.1f}" * 2).format(
+            size, *[t * 1e6 for t in times], *[p / 1024 for p in peaks]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""PolynomialGF2 multiplication at increasing degree.
+
+Times each of the multiplication algorithms, and clmul's choice between
+them, so the thresholds in gf2_polynomials.multiplication can be tuned.
+
+    python -m pure_python_gcm.benchmarks.polynomials
+"""
+from random import getrandbits
+
+from pure_python_gcm.benchmarks import best_time
+from pure_python_gcm.gf2_polynomials import PolynomialGF2
+from pure_python_gcm.gf2_polynomials.multiplication import (
+    clmul_karatsuba, clmul_schoolbook, clmul_window, window)
+
+DEGREES = [128, 1000, 10000, 100000]
+
+
+def main():
+    algorithms = [
+        ("schoolbook", clmul_schoolbook),
+        ("window 4", lambda a, b: clmul_window(a, window(b, 4), 4)),
+        ("window 8", lambda a, b: clmul_window(a, window(b, 8), 8)),
+        ("karatsuba", clmul_karatsuba),
+    ]
+    print(("{:>8}" + "{:>14}" * (len(algorithms) + 2)).format(
+        "degree", *[name for name, _ in algorithms], "__mul__", "** 3"))
+    for degree in DEGREES:
+        a = PolynomialGF2(getrandbits(degree) | (1 << degree))
+        b = PolynomialGF2(getrandbits(degree) | (1 << degree))
+        # Keep the slowest cases to a handful of calls.
+        number = max(1, 20000 // degree)
+        times = [best_time(lambda: mul(a.bitrep, b.bitrep),
+                           number if name != "schoolbook" else 1, 3)
+                 for name, mul in algorithms]
+        times.append(best_time(lambda: a * b, number, 3))
+        times.append(best_time(lambda: a ** 3, number, 3))
+        print(("{:>8}" + "{:>12.0f}us" * len(times)).format(
+            degree, *[t * 1e6 for t in times]))
+
+
+if __name__ == '__main__':
+    main()
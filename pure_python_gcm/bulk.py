@@ -0,0 +1,146 @@
+"""Decrypt or verify big collections of stored messages on every core.
+
+Records are (cipher, assoc_data, tag, iv) tuples, as returned by
+main.encrypt, all under one key. They're sent to a ProcessPoolExecutor
+in batches, so each trip to a worker carries a worthwhile amount of
+work, and each worker process sets up a GCMContext for the key once and
+keeps it for every batch after. Only a few batches per worker are ever
+in flight, so the records can come from a generator over an archive far
+bigger than memory.
+
+A record that fails to validate doesn't stop the others: its result
+says so, and the rest carry on.
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from itertools import islice
+from os import cpu_count
+
+from pure_python_gcm.aes_gcm_128 import GCMContext
+
+# Records per task sent to a worker.
+BATCH_SIZE = 256
+# Batches in flight per worker.
+BATCHES_PER_WORKER = 2
+
+
+@lru_cache(maxsize=4)
+def _worker_context(key):
+    """The GCMContext for key in this process, made on first use."""
+    return GCMContext(key)
+
+
+def _decrypt_batch(key, batch):
+    """(plaintext, assoc_data) or ValueError for each record, in a worker.
+
+    Anything wrong with a record, even its shape, gets the same generic
+    ValueError as a bad tag.
+    """
+    context, results = _worker_context(key), []
+    for record in batch:
+        try:
+            cipher, assoc_data, tag, iv = record
+            results.append(context.decrypt(cipher, assoc_data, iv, tag))
+        except Exception:
+            results.append(
+                ValueError("Could not validate message with supplied tag."))
+    return results
+
+
+def _verify_batch(key, batch):
+    """Whether each record is valid, in a worker."""
+    context = _worker_context(key)
+    results = []
+    for record in batch:
+        try:
+            cipher, assoc_data, tag, iv = record
+            results.append(context.verify_only(iv, cipher, assoc_data, tag))
+        except Exception:
+            results.append(False)
+    return results
+
+
+def _check_key(key):
+    """Raise now, rather than on the first next() of a generator."""
+    if len(key) != 16:
+        raise ValueError("Key must be 16 bytes.")
+
+
+def _run(work, key, records, executor, max_workers, batch_size, ordered):
+    """Yield (index, result) for records from work over batches."""
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers,
+                                       initializer=_worker_context,
+                                       initargs=(key,))
+    in_flight = BATCHES_PER_WORKER * (max_workers or cpu_count() or 1)
+    records, start = iter(records), 0
+    pending = deque()
+
+    def submit():
+        nonlocal start
+        batch = list(islice(records, batch_size))
+        if batch:
+            pending.append((start, executor.submit(work, key, batch)))
+            start += len(batch)
+        return bool(batch)
+
+    try:
+        more = True
+        while more and len(pending) < in_flight:
+            more = submit()
+        while pending:
+            if ordered:
+                first, future = pending.popleft()
+            else:
+                wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+                first, future = next((first, f) for first, f in pending
+                                     if f.done())
+                pending.remove((first, future))
+            results = future.result()
+            if more:
+                more = submit()
+            for i, result in enumerate(results):
+                yield first + i, result
+    finally:
+        for _, future in pending:
+            future.cancel()
+        if own_executor:
+            executor.shutdown()
+
+
+def decrypt_records(key, records, executor=None, max_workers=None,
+                    batch_size=BATCH_SIZE, ordered=True):
+    """Decrypt many (cipher, assoc_data, tag, iv) records under key.
+
+    Args:
+        key (bytes): 16 byte key the records were encrypted under.
+        records (iterable): (cipher, assoc_data, tag, iv) tuples.
+        executor (ProcessPoolExecutor or None): where to do the work.
+            None makes a pool of max_workers processes for the duration.
+        max_workers (int or None): processes for our own pool, or in
+            executor, None for one per core.
+        batch_size (int): records per task.
+        ordered (bool): yield results in record order, or as they finish.
+
+    Yields:
+        (index, result) for each record, where result is
+        (plaintext, assoc_data), or the generic ValueError if the record
+        couldn't be validated.
+    """
+    _check_key(key)
+    return _run(_decrypt_batch, key, records, executor, max_workers,
+                batch_size, ordered)
+
+
+def verify_records(key, records, executor=None, max_workers=None,
+                   batch_size=BATCH_SIZE, ordered=True):
+    """Check many (cipher, assoc_data, tag, iv) records under key.
+
+    Like decrypt_records, but nothing is decrypted, and each result is
+    True or False.
+    """
+    _check_key(key)
+    return _run(_verify_batch, key, records, executor, max_workers,
+                batch_size, ordered)
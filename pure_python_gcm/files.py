@@ -0,0 +1,125 @@
+"""Encrypt and decrypt whole files with AES-GCM-128.
+
+Files are memory-mapped and run through the streaming encryptor a chunk
+at a time, with the output written straight into a memory-mapped file of
+the right size, so only one chunk of data is ever in memory.
+
+An encrypted file is laid out as IV (12 bytes) + ciphertext + tag (16).
+"""
+import mmap
+import os
+from os import urandom
+
+from pure_python_gcm.streaming import GCMDecryptor, GCMEncryptor
+
+IV_LENGTH, TAG_LENGTH = 12, 16
+
+# Bytes of data handed to the streaming encryptor at a time.
+CHUNK_SIZE = 2**20
+
+
+def check_paths(in_path, out_path):
+    """Refuse to write over the input, which opening out_path would empty."""
+    if os.path.exists(out_path) and os.path.samefile(in_path, out_path):
+        raise ValueError("Input and output must be different files.")
+
+
+def _map_input(f):
+    """Read-only map of a file, or b'' for an empty one, which can't be."""
+    if os.fstat(f.fileno()).st_size == 0:
+        return b''
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _map_output(f, size):
+    """Resize a file and map it for writing, or b'' if it's empty."""
+    f.truncate(size)
+    if size == 0:
+        return b''
+    return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_WRITE)
+
+
+def _close(m):
+    if isinstance(m, mmap.mmap):
+        m.close()
+
+
+def _run(crypter, in_map, out_map, start, end, out_start):
+    """Feed in_map[start:end] through crypter into out_map from out_start."""
+    view = memoryview(in_map)
+    try:
+        for i in range(start, end, CHUNK_SIZE):
+            chunk = crypter.update(view[i:min(i + CHUNK_SIZE, end)])
+            out_map[out_start + i - start:
+                    out_start + i - start + len(chunk)] = chunk
+    finally:
+        view.release()
+
+
+def encrypt_file(key, in_path, out_path, assoc_data=b''):
+    """Encrypt the file at in_path into a new file at out_path.
+
+    Args:
+        key (bytes or GCMContext): 16 byte key, or context for the key.
+        in_path (str): file to encrypt.
+        out_path (str): file to write, overwritten if it exists.
+        assoc_data (bytes): additional data to authenticate with the file.
+
+    Returns:
+        length of the plaintext, in bytes.
+    """
+    check_paths(in_path, out_path)
+    iv = urandom(IV_LENGTH)
+    encryptor = GCMEncryptor(key, iv, TAG_LENGTH)
+    encryptor.update_aad(assoc_data)
+    with open(in_path, 'rb') as f_in, open(out_path, 'w+b') as f_out:
+        in_map = _map_input(f_in)
+        length = len(in_map)
+        out_map = _map_output(f_out, IV_LENGTH + length + TAG_LENGTH)
+        try:
+            out_map[:IV_LENGTH] = iv
+            _run(encryptor, in_map, out_map, 0, length, IV_LENGTH)
+            encryptor.finalize()
+            out_map[IV_LENGTH + length:] = encryptor.tag
+        finally:
+            _close(out_map)
+            _close(in_map)
+    return length
+
+
+def decrypt_file(key, in_path, out_path, assoc_data=b''):
+    """Decrypt a file written by encrypt_file into a new file at out_path.
+
+    The plaintext is only authenticated once the whole file has been
+    decrypted. If that fails, out_path is deleted and a generic
+    ValueError is raised.
+
+    Returns:
+        length of the plaintext, in bytes.
+    """
+    check_paths(in_path, out_path)
+    with open(in_path, 'rb') as f_in:
+        in_map = _map_input(f_in)
+        try:
+            length = len(in_map) - IV_LENGTH - TAG_LENGTH
+            if length < 0:
+                raise ValueError("Could not validate message with supplied "
+                                 "tag.")
+            decryptor = GCMDecryptor(key, bytes(in_map[:IV_LENGTH]),
+                                     bytes(in_map[-TAG_LENGTH:]), TAG_LENGTH)
+            decryptor.update_aad(assoc_data)
+            try:
+                with open(out_path, 'w+b') as f_out:
+                    out_map = _map_output(f_out, length)
+                    try:
+                        _run(decryptor, in_map, out_map,
+                             IV_LENGTH, IV_LENGTH + length, 0)
+                    finally:
+                        _close(out_map)
+                decryptor.finalize()
+            except ValueError:
+                os.remove(out_path)
+                raise
+        finally:
+            _close(in_map)
+    return length
@@ -1 +1,2 @@
-from .element import PolynomialGF2
\ No newline at end of file
+from .element import PolynomialGF2
+from .modulus import Modulus
@@ -1,4 +1,6 @@
 from pure_python_gcm.utilities import print_polynomial
+from .modulus import Modulus
+from .multiplication import clmul
 
 
 class PolynomialGF2:
@@ -9,6 +11,8 @@ class PolynomialGF2:
     represents the coefficient of the x^0 term and so on.
     All meaningful arithmetic operators overridden
     """
+    __slots__ = ('bitrep',)
+
     def __init__(self, bitrep):
         self.bitrep = bitrep
 
@@ -56,24 +60,10 @@ class PolynomialGF2:
     def __mul__(self, other):
         """Multiply two polynomials.
 
-        We use a clever bitshifting algorithm to find the product
-        of each pair of terms.
+        Multiplication is carry-less multiplication of the bitreps,
+        see multiplication.clmul, which picks an algorithm by size.
         """
-        a, b, p = self.bitrep, other.bitrep, 0
-        # At each step we use a >> 1 to drop the rightmost term of a,
-        # Then leftshift b << 1 to "keep both sides equal".
-        # Essentially at each step we set a = a/x and b = b*x.
-        # So the algo is basically: while we haven't dropped all terms of a
-        # If the rightmost term of a is nonzero, add b to the result
-        # Then drop the rightmost term of a, multiply b by x to compensate
-        # Which is a smart way to do: for each term of a from right to left,
-        # Add term * b to result.
-        while a > 0:
-            if a & 1:
-                p = p ^ b
-            a = a >> 1
-            b = b << 1
-        return self.__class__(p)
+        return self.__class__(clmul(self.bitrep, other.bitrep))
 
     def __rmul__(self, other):
         """Multiply two polynomials.
@@ -126,48 +116,37 @@ class PolynomialGF2:
     def modmul(self, other, modulo):
         """Multiplication of polynomials mod some other polynomial.
 
-        If f and g have the same degree, f % g = f - g = f ^ g.
-        We use this to interleave modulo with multiplication,
-        using the same algorithm as __mul__.
+        modulo can be a PolynomialGF2 or a Modulus. Either way this is one
+        unreduced product and one reduction, which is fast with a Modulus
+        and long division without one.
         """
-        # Local def function for bitreps
-        def _deg(n):
-            if n == 0:
-                return -1
-            else:
-                return n.bit_length() - 1
-        # If a or b are bigger than modulo, we need to do explicit mod first
-        if self.deg() >= modulo.deg():
-            self = self % modulo
-        if other.deg() >= modulo.deg():
-            other = other % modulo
-        a, b, p, m = self.bitrep, other.bitrep, 0, modulo.bitrep
-        while a > 0:
-            if a & 1:
-                p = p ^ b
-            a = a >> 1
-            b = b << 1
-            if _deg(b) == _deg(m):
-                b = b ^ m  # modulo step, works because deg(b) <= deg(m)
-        return self.__class__(p)
+        if isinstance(modulo, Modulus):
+            return self.__class__(modulo.mulmod(self.bitrep, other.bitrep))
+        return (self * other) % modulo
 
     def __pow__(self, power, modulo=None):
         """Exponentiation of polynomial multiplication with optional mod.
 
-        Uses a square and multiply algorithm and a modulo-aware mul function.
+        Uses a square and multiply algorithm. A PolynomialGF2 modulo is
+        wrapped in a Modulus first, so every step reduces quickly, unless
+        it's of degree < 1, which a Modulus can't be.
         """
-        # Locally define mul function based on whether it needs to be modulo
         if modulo is None:
-            def mul(a, b): return a * b
+            def mul(a, b): return clmul(a, b)
+        elif isinstance(modulo, Modulus) or modulo.deg() >= 1:
+            if not isinstance(modulo, Modulus):
+                modulo = Modulus(modulo)
+            mul = modulo.mulmod
         else:
-            def mul(a, b): return a.modmul(b, modulo)
-        register, result = self, self.__class__(1)
+            def mul(a, b):
+                return (self.__class__(a) * self.__class__(b) % modulo).bitrep
+        register, result = self.bitrep, 1
         while power > 0:
             if power % 2 == 1:
                 result = mul(result, register)
             register = mul(register, register)
             power = power >> 1
-        return result
+        return self.__class__(result)
 
     def deg(self):
         """Degree of the polynomial."""
@@ -0,0 +1,112 @@
+"""Reduction mod a fixed polynomial, a byte at a time.
+
+Reducing mod P by long division clears one bit per step. When the same P
+is used over and over, as the defining polynomial of a field is, it pays
+to precompute b*x^k mod P for every byte b, with k = deg(P). Then the top
+8 bits of anything too big can be cleared in one step: they are some b
+times x^(k+s), which is the same mod P as the table entry times x^s.
+
+Trinomials x^k + x^a + 1 and pentanomials x^k + x^c + x^b + x^a + 1, with
+their lower terms at most x^(k/2), are quicker still. For those x^k is
+the same mod P as its few lower terms, so everything from x^k up can be
+folded down in one go, as a handful of shifts and xors. Two or three
+rounds of that reduce any product, and the number of rounds depends
+only on P, not on the product.
+"""
+from .multiplication import clmul
+
+
+class Modulus:
+    """A polynomial P of degree k >= 1 with its byte folding table.
+
+    Works on bitreps, and is accepted in place of P by
+    PolynomialGF2.modmul and pow.
+    """
+    def __init__(self, P):
+        if P.deg() < 1:
+            raise ValueError("Modulus must have degree at least 1: {0}"
+                             .format(P))
+        self.P = P
+        self.k = k = P.deg()
+        m = P.bitrep
+        # singles[j] = x^(k+j) mod P, each the last one times x.
+        singles = [m ^ (1 << k)]
+        for _ in range(7):
+            s = singles[-1] << 1
+            singles.append(s ^ m if s >> k else s)
+        # fold[b] = b*x^k mod P, built as in multiplication.window.
+        self.fold = fold = [0] * 256
+        for j in range(8):
+            bit, single = 1 << j, singles[j]
+            for i in range(bit):
+                fold[bit | i] = fold[i] ^ single
+        # For a sparse P, the powers of x below x^k in it, and the rounds
+        # of folding that reduce a product, else None.
+        self.terms = self.rounds = None
+        lower = [i for i in range(k) if (m >> i) & 1]
+        if len(lower) in (2, 4) and lower[-1] <= k // 2:
+            self.terms, self.rounds, top = lower, 0, 2*k - 2
+            while top >= k:
+                top, self.rounds = top - k + lower[-1], self.rounds + 1
+        # Built by square on first use.
+        self._square_tables = None
+
+    def __repr__(self):
+        return 'Modulus({0!r})'.format(self.P)
+
+    def reduce(self, n):
+        """n mod P, for a bitrep n of any size."""
+        k, fold = self.k, self.fold
+        if self.terms is not None and n.bit_length() < 2*k:
+            return self._reduce_sparse(n)
+        top = n.bit_length() - k
+        while top > 0:
+            # Replace the highest (up to) 8 bits at x^(k+shift) and above.
+            shift = top - 8 if top > 8 else 0
+            n = ((n & ((1 << (k + shift)) - 1))
+                 ^ (fold[n >> (k + shift)] << shift))
+            top = n.bit_length() - k
+        return n
+
+    def _reduce_sparse(self, n):
+        """n mod a sparse P, for n of degree < 2k - 1, in fixed rounds."""
+        k, mask = self.k, (1 << self.k) - 1
+        for _ in range(self.rounds):
+            high, n = n >> k, n & mask
+            for term in self.terms:
+                n ^= high << term
+        return n
+
+    def mulmod(self, a, b):
+        """a*b mod P for bitreps a and b: one product, then one reduction."""
+        return self.reduce(clmul(a, b))
+
+    def square(self, a):
+        """a*a mod P for a bitrep a of degree < k.
+
+        Squaring is linear over GF(2), so like GHASHTable this looks up
+        each byte of a in a table of its own, the squares of every byte
+        in that position, and adds them up. The tables are built on the
+        first call, and take 256*ceil(k/8) ints.
+        """
+        if self._square_tables is None:
+            self._square_tables = self._build_square_tables()
+        tables, z = self._square_tables, 0
+        for table, byte in zip(tables, a.to_bytes(len(tables), 'little')):
+            z ^= table[byte]
+        return z
+
+    def _build_square_tables(self):
+        # x^(2i) mod P for i < k, each the last one times x^2.
+        singles = [1]
+        for _ in range(self.k - 1):
+            singles.append(self.reduce(singles[-1] << 2))
+        tables = []
+        for j in range(0, self.k, 8):
+            table = [0] * 256
+            for i, single in enumerate(singles[j:j + 8]):
+                bit = 1 << i
+                for n in range(bit):
+                    table[bit | n] = table[n] ^ single
+            tables.append(table)
+        return tables
@@ -0,0 +1,98 @@
+"""Carry-less multiplication of polynomial bitreps, by size.
+
+Multiplying polynomials over GF(2) is integer multiplication without the
+carries, so the product of bitreps a and b is the xor of b << i for every
+set bit i of a. clmul picks between three ways of doing that:
+
+    short a: a 4 bit window over b, see clmul_window
+    medium: an 8 bit window over b
+    both long: Karatsuba, splitting down to medium sized products
+
+The thresholds are bit lengths, tuned by
+python -m pure_python_gcm.benchmarks.polynomials
+"""
+
+# Below this many bits in the shorter operand, use a 4 bit window.
+WINDOW_8_THRESHOLD = 256
+# Above this many bits in both operands, split them with Karatsuba.
+KARATSUBA_THRESHOLD = 8192
+
+
+def clmul_schoolbook(a, b):
+    """One bit of a at a time. Only here for comparison."""
+    p = 0
+    # At each step we use a >> 1 to drop the rightmost term of a,
+    # Then leftshift b << 1 to "keep both sides equal".
+    # Essentially at each step we set a = a/x and b = b*x.
+    # So the algo is basically: while we haven't dropped all terms of a
+    # If the rightmost term of a is nonzero, add b to the result
+    # Then drop the rightmost term of a, multiply b by x to compensate
+    # Which is a smart way to do: for each term of a from right to left,
+    # Add term * b to result.
+    while a > 0:
+        if a & 1:
+            p = p ^ b
+        a = a >> 1
+        b = b << 1
+    return p
+
+
+def window(b, bits):
+    """b times every polynomial of degree < bits, indexed by bitrep.
+
+    Every entry is the sum of a smaller entry and b times a power of x,
+    so the table costs one xor per entry.
+    """
+    w = [0] * (1 << bits)
+    for k in range(bits):
+        bit, product = 1 << k, b << k
+        for i in range(bit):
+            w[bit | i] = w[i] ^ product
+    return w
+
+
+def clmul_window(a, b_window, bits):
+    """Carry-less a*b, bits bits of a at a time, from b_window = window(b).
+
+    Each group of bits of a picks its multiple of b out of the window,
+    which is shifted into place and added. Walks a as bytes, so a is
+    never shifted itself. bits must be 4 or 8.
+    """
+    p, shift = 0, 0
+    for byte in a.to_bytes((a.bit_length() + 7) // 8, 'little'):
+        if byte:
+            if bits == 8:
+                p ^= b_window[byte] << shift
+            else:
+                p ^= (b_window[byte & 0xF]
+                      ^ (b_window[byte >> 4] << 4)) << shift
+        shift += 8
+    return p
+
+
+def clmul_karatsuba(a, b):
+    """Carry-less a*b by Karatsuba's three-multiplication split.
+
+    With a = a1*x^h + a0 and b = b1*x^h + b0,
+        a*b = a1*b1*x^2h + ((a0+a1)(b0+b1) - a0*b0 - a1*b1)*x^h + a0*b0
+    and subtraction is addition, which is xor.
+    """
+    h = max(a.bit_length(), b.bit_length()) // 2
+    mask = (1 << h) - 1
+    a0, a1, b0, b1 = a & mask, a >> h, b & mask, b >> h
+    z0, z2 = clmul(a0, b0), clmul(a1, b1)
+    z1 = clmul(a0 ^ a1, b0 ^ b1) ^ z0 ^ z2
+    return (z2 << (2*h)) ^ (z1 << h) ^ z0
+
+
+def clmul(a, b):
+    """Carry-less product of non-negative ints a and b."""
+    if a.bit_length() > b.bit_length():
+        a, b = b, a
+    if a < 2:
+        return b if a else 0
+    if a.bit_length() < WINDOW_8_THRESHOLD:
+        return clmul_window(a, window(b, 4), 4)
+    if a.bit_length() <= KARATSUBA_THRESHOLD:
+        return clmul_window(a, window(b, 8), 8)
+    return clmul_karatsuba(a, b)
@@ -1,2 +1,3 @@
 from .element import GF2kElement
-from .field import GF2k
\ No newline at end of file
+from .field import GF2k
+from .log_tables import LogTableElement
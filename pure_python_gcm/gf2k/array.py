@@ -0,0 +1,192 @@
+import numpy as np
+
+from pure_python_gcm.utilities import REVERSED_BYTES
+
+# REVERSED_BYTES as an array, to index with a whole uint8 array at once.
+REVERSED_BITS = np.frombuffer(REVERSED_BYTES, dtype=np.uint8)
+
+_ONE = np.uint64(1)
+
+# GF2kArray._shifted_moduli results, keyed by (k, P.bitrep).
+_SHIFTED_MODULI = {}
+
+
+def _shift_left_one(words):
+    """Shift rows of little-endian uint64 words left by one bit."""
+    shifted = words << _ONE
+    shifted[:, 1:] |= words[:, :-1] >> np.uint64(63)
+    return shifted
+
+
+def _bit_masks(words, i):
+    """All ones for the rows with bit i set, zero for the rest."""
+    bits = (words[:, i // 64] >> np.uint64(i % 64)) & _ONE
+    return (-bits)[:, None]
+
+
+class GF2kArray:
+    """N elements of GF(2^k) packed in an (N, ceil(k/64)) uint64 matrix.
+
+    Row i holds the bitrep of element i as little-endian 64 bit words,
+    so the least significant bit of word 0 is the coefficient of x^0,
+    the same convention as PolynomialGF2. Arithmetic works on all N
+    elements at once with numpy, looping over bits rather than elements.
+    Scalars can be GF2kElements of the same field.
+    Needs numpy, which the rest of the package doesn't.
+    """
+    def __init__(self, words, field):
+        self.words = words
+        self.field = field
+
+    @staticmethod
+    def width(field):
+        """Number of uint64 words per element."""
+        return (field.k + 63) // 64
+
+    @classmethod
+    def fromBytes(cls, buffer, field):
+        """Convert a buffer of ceil(k/8) byte blocks.
+
+        Blocks are read the same way as by GF2k.getElementFromBytes.
+        """
+        block_length, width = (field.k + 7) // 8, cls.width(field)
+        if len(buffer) % block_length != 0:
+            raise ValueError("Buffer length must be a multiple of {0}, not "
+                             "{1}".format(block_length, len(buffer)))
+        blocks = np.frombuffer(buffer, dtype=np.uint8)
+        blocks = blocks.reshape(-1, block_length)
+        padded = np.zeros((len(blocks), 8*width), dtype=np.uint8)
+        padded[:, :block_length] = REVERSED_BITS[blocks]
+        words = padded.view('<u8').astype(np.uint64)
+        if field.k % 64 and (words[:, -1] >> np.uint64(field.k % 64)).any():
+            raise ValueError("Byte blocks must have only {0} significant bits"
+                             .format(field.k))
+        return cls(words, field)
+
+    @classmethod
+    def fromElements(cls, elements, field):
+        """Pack a sequence of GF2kElements or bitreps."""
+        width = cls.width(field)
+        words = np.zeros((len(elements), width), dtype=np.uint64)
+        for i, element in enumerate(elements):
+            words[i] = cls._scalar_words(element, field)[0]
+        return cls(words, field)
+
+    @classmethod
+    def _scalar_words(cls, value, field):
+        """A single element or bitrep as a (1, width) row of words."""
+        if not isinstance(value, int):
+            value = value.poly.bitrep
+        if value >= 2**field.k:
+            raise ValueError("Initialising element too large to be an"
+                             "element of GF(2^{0}".format(field.k))
+        return np.array([[(value >> (64*j)) & (2**64 - 1)
+                          for j in range(cls.width(field))]], dtype=np.uint64)
+
+    def _other_words(self, other):
+        if isinstance(other, GF2kArray):
+            if other.field != self.field:
+                raise ValueError("Arrays must be over the same field.")
+            return other.words
+        return self._scalar_words(other, self.field)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, index):
+        """An element for an integer index, a GF2kArray for a slice."""
+        if isinstance(index, slice):
+            return self.__class__(self.words[index], self.field)
+        return self.field.getElement(sum(int(word) << (64*j) for j, word
+                                         in enumerate(self.words[index])))
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __eq__(self, other):
+        """Equal if over the same field with all elements equal."""
+        return (isinstance(other, GF2kArray) and self.field == other.field
+                and np.array_equal(self.words, other.words))
+
+    def __add__(self, other):
+        """Elementwise addition, which is xor of the words."""
+        return self.__class__(self.words ^ self._other_words(other),
+                              self.field)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __neg__(self):
+        return self
+
+    def __sub__(self, other):
+        return self + other
+
+    def __rsub__(self, other):
+        return self + other
+
+    def __mul__(self, other):
+        """Elementwise multiplication mod P."""
+        p = self.clmul(self.words, self._other_words(other), self.field)
+        return self.__class__(self.reduce(p, self.field), self.field)
+
+    def __rmul__(self, other):
+        return self * other
+
+    def sum(self):
+        """Sum of all the elements, as a GF2kElement."""
+        total = np.bitwise_xor.reduce(self.words, axis=0)
+        return self.__class__(total[None, :], self.field)[0]
+
+    def toBytes(self):
+        """All elements as ceil(k/8) byte blocks joined together."""
+        block_length = (self.field.k + 7) // 8
+        blocks = self.words.astype('<u8').view(np.uint8)
+        blocks = blocks.reshape(len(self), -1)[:, :block_length]
+        return REVERSED_BITS[blocks].tobytes()
+
+    def toElements(self):
+        return list(self)
+
+    @classmethod
+    def clmul(cls, a, b, field):
+        """Unreduced carry-less products of rows of word matrices a and b.
+
+        Either can be a single row, which is broadcast. Shift-and-add:
+        for each bit i, add b * x^i to the rows whose a has bit i set.
+        Returns rows twice as wide.
+        """
+        width = cls.width(field)
+        rows = max(len(a), len(b))
+        shifted_b = np.zeros((len(b), 2*width), dtype=np.uint64)
+        shifted_b[:, :width] = b
+        p = np.zeros((rows, 2*width), dtype=np.uint64)
+        for i in range(field.k):
+            p ^= shifted_b & _bit_masks(a, i)
+            shifted_b = _shift_left_one(shifted_b)
+        return p
+
+    @classmethod
+    def reduce(cls, p, field):
+        """Reduce rows of double width words mod the field's P.
+
+        Clears each bit from x^(2k-2) down to x^k by adding the matching
+        shift of P, as in polynomial long division.
+        """
+        width, p = cls.width(field), p.copy()
+        shifted_p = cls._shifted_moduli(field)
+        for j in range(field.k - 2, -1, -1):
+            p ^= shifted_p[j] & _bit_masks(p, field.k + j)
+        return p[:, :width]
+
+    @classmethod
+    def _shifted_moduli(cls, field):
+        """P * x^j for j < k - 1 as double width rows, cached per field."""
+        key = (field.k, field.P.bitrep)
+        if key not in _SHIFTED_MODULI:
+            width = cls.width(field)
+            _SHIFTED_MODULI[key] = np.array(
+                [[((field.P.bitrep << j) >> (64*i)) & (2**64 - 1)
+                  for i in range(2*width)] for j in range(field.k - 1)],
+                dtype=np.uint64).reshape(-1, 1, 2*width)
+        return _SHIFTED_MODULI[key]
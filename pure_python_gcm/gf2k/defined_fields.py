@@ -1,5 +1,11 @@
 from pure_python_gcm.gf2_polynomials import PolynomialGF2
 from .field import GF2k
 
+# GF(2^64), defined by x^64 + x^4 + x^3 + x + 1
+GF2_64 = GF2k(64, PolynomialGF2((1 << 64) + (1 << 4) + (1 << 3) + 2 + 1))
+
 # GF(2^128), defined by x^128 + x^7 + x^2 + x + 1
 GF2_128 = GF2k(128, PolynomialGF2((7 + (1 << 7) + (1 << 128))))
+
+# GF(2^256), defined by x^256 + x^10 + x^5 + x^2 + 1
+GF2_256 = GF2k(256, PolynomialGF2((1 << 256) + (1 << 10) + (1 << 5) + 4 + 1))
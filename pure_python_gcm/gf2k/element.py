@@ -1,5 +1,5 @@
 from pure_python_gcm.gf2_polynomials import PolynomialGF2
-from pure_python_gcm.utilities import reverse_bits
+from pure_python_gcm.utilities import REVERSED_BYTES
 
 
 class GF2kElement:
@@ -10,7 +10,11 @@ class GF2kElement:
     multiplication within the field GF(2^k).
     Also uses the field object to generate new elements.
     All arithmetic other than modulo is deferred to PolynomialGF2.
+    Results of arithmetic are made with fromTrustedPoly, skipping the
+    checks in __init__, since they can only be in range.
     """
+    __slots__ = ('poly', 'field')
+
     def __init__(self, value, field):
         # We may occasionally want to get a new element direct from a bitrep.
         # Hence we test for the type of the initialising value and handle it.
@@ -26,6 +30,17 @@ class GF2kElement:
                              .format(value))
         self.field = field
 
+    @classmethod
+    def fromTrustedPoly(cls, poly, field):
+        """Make an element from a PolynomialGF2 known to be of degree < k.
+
+        For internal use, where the checks in __init__ are known to pass.
+        """
+        element = cls.__new__(cls)
+        element.poly = poly
+        element.field = field
+        return element
+
     def __repr__(self):
         return self.poly.__repr__()
 
@@ -43,7 +58,7 @@ class GF2kElement:
         Addition needs no special handling, we simply defer to PolynomialGF2k
         and promote the result to a field element.
         """
-        return self.field.getElement(self.poly + other.poly)
+        return self.field.elementFromTrustedPoly(self.poly + other.poly)
 
     def __radd__(self, other):
         """Add field elements.
@@ -73,10 +88,11 @@ class GF2kElement:
     def __mul__(self, other):
         """Multiplication of field elements.
 
-        Here we ask the parent field object for the defining polynomial
-        and do multiplication mod that.
+        Here we ask the parent field object for the defining polynomial,
+        with its precomputed reduction, and do multiplication mod that.
         """
-        return self.field.getElement(self.poly.modmul(other.poly, self.field.P))
+        return self.field.elementFromTrustedPoly(
+            self.poly.modmul(other.poly, self.field.modulus))
 
     def __rmul__(self, other):
         """Multiplication of field elements.
@@ -90,14 +106,15 @@ class GF2kElement:
 
         We defer to PolynomialGF2k __pow__ with modulo P.
         """
-        return self.field.getElement(pow(self.poly, power, self.field.P))
+        return self.field.elementFromTrustedPoly(
+            pow(self.poly, power, self.field.modulus))
 
     def __invert__(self):
         """Multiplicative inverse of this element.
 
-        PolynomialGF2k has a method for this using extended Euclidean.
+        The parent field object picks the fastest way for its size.
         """
-        return self.field.getElement(self.poly.modinv(self.field.P))
+        return self.field.elementFromTrustedPoly(self.field.invert(self.poly))
 
     def __truediv__(self, other):
         """Division: a/b == a * b^-1."""
@@ -113,6 +130,5 @@ class GF2kElement:
         Uses the convention that the leftmost bit of the bytestring
         represents the coefficient of the x^0 term.
         """
-        return bytes([reverse_bits(byte)
-                      for byte in self.poly.bitrep.to_bytes(
-                        int(self.field.k/8), 'little')])
+        return self.poly.bitrep.to_bytes((self.field.k + 7) // 8,
+                                         'little').translate(REVERSED_BYTES)
@@ -1,28 +1,116 @@
 from random import randint
 
+from pure_python_gcm.gf2_polynomials import Modulus
 from pure_python_gcm.gf2k import GF2kElement
-from pure_python_gcm.utilities import reverse_bits
+from pure_python_gcm.gf2k.log_tables import (LOG_TABLE_MAX_K,
+                                             LogTableElement, is_irreducible,
+                                             log_tables)
+from pure_python_gcm.utilities import REVERSED_BYTES
+
+# Fields up to this degree invert by Itoh-Tsujii, bigger ones by extended
+# Euclidean, which overtakes it at around k = 500.
+ITOH_TSUJII_MAX_K = 384
 
 
 class GF2k:
-    def __init__(self, k, P, element_class=GF2kElement):
+    def __init__(self, k, P, element_class=None):
+        """GF(2^k) defined by P, with elements of class element_class.
+
+        element_class defaults to LogTableElement for fields small enough
+        for log tables, and GF2kElement otherwise, or if P is reducible
+        and there are no log tables to be had.
+        """
         if P.deg() != k:
             raise ValueError("Defining polynomial must have degree {0}: {1}"
                              .format(k, P))
         self.P = P
         self.k = k
+        # P with its reduction table, for multiplying elements.
+        self.modulus = Modulus(P)
+        if element_class is None:
+            element_class = (
+                LogTableElement
+                if k <= LOG_TABLE_MAX_K and is_irreducible(self.modulus)
+                else GF2kElement)
         self.element_class = element_class
-        self.zero = self.getElement(0)
-        self.one = self.getElement(1)
+        # Set by logTables on first use.
+        self._log_tables = None
+        # Interned: getElement and arithmetic results hand back these
+        # objects for 0 and 1 rather than making new ones.
+        self.zero = self.element_class(0, self)
+        self.one = self.element_class(1, self)
 
     def __eq__(self, other):
         return isinstance(other, type(self)) and self.k == other.k
 
     def getElement(self, value):
+        if (value == 0 or value == 1) and isinstance(value, int):
+            return self.one if value else self.zero
         return self.element_class(value, self)
 
+    def logTables(self):
+        """Log and antilog tables for this field, see log_tables.
+
+        Built on first use, and shared with any other field with the same
+        k and P.
+        """
+        if self._log_tables is None:
+            self._log_tables = log_tables(self)
+        return self._log_tables
+
+    def elementFromTrustedPoly(self, poly):
+        """Element for a PolynomialGF2 known to be of degree < k, unchecked.
+
+        For the results of field arithmetic, which are always in range.
+        """
+        if poly.bitrep < 2:
+            return self.one if poly.bitrep else self.zero
+        return self.element_class.fromTrustedPoly(poly, self)
+
+    def invert(self, poly):
+        """Inverse mod P of a nonzero PolynomialGF2 of degree < k.
+
+        By whichever of invertItohTsujii and invertEuclidean is faster
+        for a field this size. Raises ArithmeticError if there is none,
+        which happens only if P is reducible.
+        """
+        if self.k <= ITOH_TSUJII_MAX_K:
+            inverse = self.invertItohTsujii(poly)
+            # Itoh-Tsujii trusts P to be irreducible, Euclidean doesn't.
+            if self.modulus.mulmod(poly.bitrep, inverse.bitrep) == 1:
+                return inverse
+        return self.invertEuclidean(poly)
+
+    def invertItohTsujii(self, poly):
+        """Inverse by Itoh-Tsujii: a^-1 = a^(2^k - 2) = (a^(2^(k-1) - 1))^2.
+
+        a^(2^m - 1) for m = k - 1 is built up from a = a^(2^1 - 1), one
+        binary digit of k - 1 at a time, with
+            a^(2^(2m) - 1) = (a^(2^m - 1))^(2^m) * a^(2^m - 1)
+            a^(2^(m+1) - 1) = (a^(2^m - 1))^2 * a
+        That takes k - 1 squarings, which are table lookups, and only
+        about 2*log2(k) multiplications. Needs P to be irreducible, and
+        gives a wrong answer rather than an error if it isn't.
+        """
+        if poly.bitrep == 0:
+            raise ArithmeticError("No inverse in {0} for 0".format(self.P))
+        modulus, a = self.modulus, poly.bitrep
+        b, m = a, 1
+        for digit in bin(self.k - 1)[3:]:
+            c = b
+            for _ in range(m):
+                c = modulus.square(c)
+            b, m = modulus.mulmod(c, b), 2*m
+            if digit == '1':
+                b, m = modulus.mulmod(modulus.square(b), a), m + 1
+        return poly.__class__(modulus.square(b))
+
+    def invertEuclidean(self, poly):
+        """Inverse by extended Euclidean, with PolynomialGF2.modinv."""
+        return poly.modinv(self.P)
+
     def getRandomElement(self):
-        return self.getElement(randint(0, 2**self.k))
+        return self.getElement(randint(0, 2**self.k - 1))
 
     def getElementFromBytes(self, byte_block):
         """Convert a byte string into a field element.
@@ -35,9 +123,45 @@ class GF2k:
         ie there must be only k significant bits.
         All of this is irrelevant for the basic use case of 2^128: 16 bytes.
         """
-        val = int.from_bytes(bytes([reverse_bits(byte) for byte in byte_block])
-                             , 'little')
+        val = int.from_bytes(bytes(byte_block).translate(REVERSED_BYTES),
+                             'little')
         if val.bit_length() > self.k:
             raise ValueError("Byte block must have only {0} significant bits"
                              .format(self.k))
         return self.getElement(val)
+
+    def bitrepsFromBytes(self, buffer):
+        """Convert a buffer of byte blocks into a list of element bitreps.
+
+        Blocks are as for getElementFromBytes, but the bits of the whole
+        buffer are reversed in one go, and no element objects are made.
+        """
+        block_length = (self.k + 7) // 8
+        if len(buffer) % block_length != 0:
+            raise ValueError("Buffer length must be a multiple of {0}, not "
+                             "{1}".format(block_length, len(buffer)))
+        reversed_buffer = bytes(buffer).translate(REVERSED_BYTES)
+        bitreps = [int.from_bytes(reversed_buffer[i:i+block_length], 'little')
+                   for i in range(0, len(reversed_buffer), block_length)]
+        if any(bitrep.bit_length() > self.k for bitrep in bitreps):
+            raise ValueError("Byte blocks must have only {0} significant bits"
+                             .format(self.k))
+        return bitreps
+
+    def bytesFromBitreps(self, bitreps):
+        """Convert element bitreps to byte blocks, joined into one buffer.
+
+        The inverse of bitrepsFromBytes, and the same as joining up
+        toBytes of each element.
+        """
+        block_length = (self.k + 7) // 8
+        return b''.join(bitrep.to_bytes(block_length, 'little')
+                        for bitrep in bitreps).translate(REVERSED_BYTES)
+
+    def getArrayFromBytes(self, buffer):
+        """Convert a buffer of byte blocks into a GF2kArray of elements.
+
+        Blocks are as for getElementFromBytes. Needs numpy.
+        """
+        from pure_python_gcm.gf2k.array import GF2kArray
+        return GF2kArray.fromBytes(buffer, self)
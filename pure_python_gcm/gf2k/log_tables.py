@@ -0,0 +1,141 @@
+"""Log and antilog table arithmetic for small fields.
+
+Every nonzero element of GF(2^k) is a power of a generator g, so with
+log[a] = i and antilog[i] = a for a = g^i, multiplication is addition of
+logs, division subtraction, and so on. The tables hold 2^k entries
+each, so this is only for small k. GF2k uses LogTableElement for fields
+up to LOG_TABLE_MAX_K, when P is irreducible so that there is a g.
+"""
+from pure_python_gcm.gf2_polynomials import PolynomialGF2
+from pure_python_gcm.gf2_polynomials.multiplication import (clmul_window,
+                                                            window)
+
+from .element import GF2kElement
+
+# Biggest field degree GF2k makes LogTableElements for by default.
+LOG_TABLE_MAX_K = 16
+
+# log_tables results, keyed by (k, P.bitrep).
+_LOG_TABLES = {}
+
+
+def _prime_factors(n):
+    factors, q = [], 2
+    while q*q <= n:
+        if n % q == 0:
+            factors.append(q)
+            while n % q == 0:
+                n //= q
+        q += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def is_irreducible(modulus):
+    """Whether the P of a Modulus is irreducible, by Rabin's test.
+
+    P of degree k is irreducible if and only if x^(2^k) = x mod P, and
+    x^(2^(k/q)) - x is prime to P for every prime q dividing k. Takes k
+    squarings, so it is cheap next to building tables.
+    """
+    k, x = modulus.k, modulus.reduce(2)
+    powers = [x]
+    for _ in range(k):
+        powers.append(modulus.square(powers[-1]))
+    if powers[k] != x:
+        return False
+    return all(modulus.P.gcd(PolynomialGF2(powers[k // q] ^ x)).bitrep == 1
+               for q in _prime_factors(k))
+
+
+def find_generator(field):
+    """Smallest bitrep g generating the multiplicative group of field.
+
+    g generates it if g^(2^k - 1) = 1 but g^((2^k - 1)/q) != 1 for every
+    prime q dividing 2^k - 1. There is one exactly when P is
+    irreducible, and ValueError is raised straight away if it isn't.
+    """
+    order, modulus = 2**field.k - 1, field.modulus
+    if not is_irreducible(modulus):
+        raise ValueError("No generator for GF(2^{0}) mod {1}, as it is "
+                         "reducible".format(field.k, field.P))
+    factors = _prime_factors(order)
+    for g in range(1, 2**field.k):
+        poly = PolynomialGF2(g)
+        if (pow(poly, order, modulus).bitrep == 1
+                and all(pow(poly, order // q, modulus).bitrep != 1
+                        for q in factors)):
+            return g
+    raise ValueError("No generator for GF(2^{0}) mod {1}, is it irreducible?"
+                     .format(field.k, field.P))
+
+
+def log_tables(field):
+    """The log and antilog tables for field, built once per (k, P).
+
+    log[a] is the discrete log of bitrep a to the base find_generator,
+    with log[0] unused. antilog runs over two periods, 2*(2^k - 1)
+    entries, so antilog[log[a] + log[b]] needs no reduction.
+    """
+    key = (field.k, field.P.bitrep)
+    if key not in _LOG_TABLES:
+        order, modulus = 2**field.k - 1, field.modulus
+        g_window = window(find_generator(field), 4)
+        log, antilog = [0] * (order + 1), [0] * order
+        v = 1
+        for i in range(order):
+            antilog[i], log[v] = v, i
+            v = modulus.reduce(clmul_window(v, g_window, 4))
+        _LOG_TABLES[key] = log, antilog + antilog
+    return _LOG_TABLES[key]
+
+
+class LogTableElement(GF2kElement):
+    """GF2kElement doing multiplication and friends by table lookup.
+
+    Uses the tables from the parent field's logTables. Addition, and
+    everything else, is as for GF2kElement.
+    """
+    __slots__ = ()
+
+    def _fromLog(self, i):
+        log, antilog = self.field.logTables()
+        return self.field.elementFromTrustedPoly(
+            PolynomialGF2(antilog[i % (len(log) - 1)]))
+
+    def __mul__(self, other):
+        """Multiplication of field elements, by adding logs."""
+        a, b = self.poly.bitrep, other.poly.bitrep
+        if a == 0 or b == 0:
+            return self.field.zero
+        log, antilog = self.field.logTables()
+        return self.field.elementFromTrustedPoly(
+            PolynomialGF2(antilog[log[a] + log[b]]))
+
+    def __pow__(self, power):
+        """Exponential of field multiplication, by multiplying the log.
+
+        Negative powers are powers of the inverse.
+        """
+        if self.poly.bitrep == 0:
+            if power < 0:
+                raise ArithmeticError("No inverse in {0} for 0"
+                                      .format(self.field.P))
+            return self.field.zero if power else self.field.one
+        log, _ = self.field.logTables()
+        return self._fromLog(log[self.poly.bitrep] * power)
+
+    def __invert__(self):
+        """Multiplicative inverse, by negating the log."""
+        return self ** -1
+
+    def __truediv__(self, other):
+        """Division, by subtracting logs."""
+        if other.poly.bitrep == 0:
+            raise ArithmeticError("No inverse in {0} for 0"
+                                  .format(self.field.P))
+        if self.poly.bitrep == 0:
+            return self.field.zero
+        log, _ = self.field.logTables()
+        return self._fromLog(log[self.poly.bitrep] - log[other.poly.bitrep])
@@ -0,0 +1,201 @@
+"""Table-driven GHASH for a fixed hash subkey.
+
+Blocks are handled as plain ints in GCM's own bit order:
+int.from_bytes(block, 'big'), so the most significant bit is the
+coefficient of the x^0 term. This is the reverse of the PolynomialGF2
+convention, but it's the one NIST's algorithms are written in and it
+saves reflecting every byte of every block. Carry-less products don't
+care about bit order, as reflecting both factors just reflects the
+product, so the windowed multiplication from gf2_polynomials works here.
+"""
+from pure_python_gcm.gf2_polynomials.multiplication import (clmul_window,
+                                                            window)
+
+# x^128 + x^7 + x^2 + x + 1 with the x^128 term dropped, in GCM bit order.
+R = 0xE1 << 120
+
+
+def mul_x(v):
+    """Multiply a GCM-ordered block int by x in GF(2^128).
+
+    Multiplying by x moves every coefficient one place towards x^127,
+    which is a right shift in this bit order. If the x^127 coefficient
+    falls off the end we add back x^128 mod P.
+    """
+    if v & 1:
+        return (v >> 1) ^ R
+    return v >> 1
+
+
+# Mask for the low 127 bits of a 255 bit unreduced product.
+_LOW_127 = (1 << 127) - 1
+
+
+def reduce(p):
+    """Reduce a 255 bit GCM-ordered product mod x^128 + x^7 + x^2 + x + 1.
+
+    In the carry-less product of two GCM-ordered ints x^d is at bit
+    254 - d, so the top 128 bits are already x^0..x^127. The low 127 bits are
+    x^128..x^254, which we fold back down as (x^7 + x^2 + x + 1) times
+    that part divided by x^128. That can overshoot by up to x^133, so the
+    overshoot is kept in 7 guard bits and folded once more.
+    """
+    high = (p & _LOW_127) << 1
+    w = (high << 7) ^ (high << 6) ^ (high << 5) ^ high
+    over = (w & 0x7F) << 121
+    return ((p >> 127) ^ (w >> 7)
+            ^ over ^ (over >> 1) ^ (over >> 2) ^ (over >> 7))
+
+
+def gf128_mul(x, y):
+    """Multiply two GCM-ordered block ints in GF(2^128)."""
+    return reduce(clmul_window(x, window(y, 4), 4))
+
+
+def gf128_pow(x, power):
+    """Raise a GCM-ordered block int to a non-negative power in GF(2^128)."""
+    result = 1 << 127  # x^0
+    while power > 0:
+        if power & 1:
+            result = gf128_mul(result, x)
+        x = gf128_mul(x, x)
+        power >>= 1
+    return result
+
+
+def check_blocks(bytes_string):
+    """Raise ValueError unless bytes_string is whole 16 byte blocks."""
+    if len(bytes_string) % 16 != 0:
+        raise ValueError("Input bytes_string length must be a multiple "
+                         "of 16, not {0}".format(len(bytes_string)))
+
+
+def ghash_update(h, y, bytes_string):
+    """Continue a GHASH computation without any precomputed tables.
+
+    h is the subkey and y the accumulator, both GCM-ordered ints, and the
+    new accumulator is returned as an int. Costs more per block than
+    GHASHTable but nothing up front, so it wins on short inputs.
+    """
+    check_blocks(bytes_string)
+    h_window, from_bytes = window(h, 4), int.from_bytes
+    for i in range(0, len(bytes_string), 16):
+        y = reduce(clmul_window(y ^ from_bytes(bytes_string[i:i+16], 'big'),
+                                h_window, 4))
+    return y
+
+
+class GHASHTable:
+    """Shoup-style multiplication tables for one hash subkey H.
+
+    Multiplication by H is linear, so X*H is the sum of the products of H
+    with each byte (or nibble) of X in its own position. For each position
+    we precompute all 256 (or 16) of those products once, after which a
+    multiplication is one table lookup per position and no reduction.
+    The tables take 64 KB for bits=8 and 8 KB for bits=4.
+    """
+    def __init__(self, subkey, bits=8):
+        if len(subkey) != 16:
+            raise ValueError("GHASH subkey must be 16 bytes, not {0}"
+                             .format(len(subkey)))
+        if bits not in (4, 8):
+            raise ValueError("Table width must be 4 or 8 bits, not {0}"
+                             .format(bits))
+        self.subkey = subkey
+        self.bits = bits
+        # x^n * H for n = 0..127, the products with single-bit blocks.
+        singles = []
+        v = int.from_bytes(subkey, 'big')
+        for _ in range(128):
+            singles.append(v)
+            v = mul_x(v)
+        # Position j covers x^(bits*j) .. x^(bits*j + bits - 1), and within
+        # an index the most significant bit is the lowest degree term.
+        # Every other entry is the sum of a smaller entry and a single bit.
+        self.tables = []
+        for j in range(128 // bits):
+            table = [0] * (1 << bits)
+            for k in range(bits):
+                bit, product = 1 << k, singles[bits*j + bits - 1 - k]
+                for i in range(bit):
+                    table[bit | i] = table[i] ^ product
+            self.tables.append(table)
+
+    def mul(self, x):
+        """Multiply a GCM-ordered block int by H."""
+        z = 0
+        if self.bits == 8:
+            for table, byte in zip(self.tables, x.to_bytes(16, 'big')):
+                z ^= table[byte]
+        else:
+            tables = self.tables
+            for j, byte in enumerate(x.to_bytes(16, 'big')):
+                z ^= tables[2*j][byte >> 4] ^ tables[2*j + 1][byte & 0xF]
+        return z
+
+    def update(self, y, bytes_string):
+        """Continue a GHASH computation from accumulator y over more blocks.
+
+        Returns the new accumulator as an int, so callers can feed in
+        data piece by piece without joining it all together first.
+        """
+        check_blocks(bytes_string)
+        mul, from_bytes = self.mul, int.from_bytes
+        for i in range(0, len(bytes_string), 16):
+            y = mul(y ^ from_bytes(bytes_string[i:i+16], 'big'))
+        return y
+
+    def digest(self, bytes_string):
+        """GHASH of bytes_string under this table's subkey, as bytes."""
+        return self.update(0, bytes_string).to_bytes(16, 'big')
+
+
+class AggregatedGHASH:
+    """GHASH for a fixed subkey H, n blocks per reduction.
+
+    Unrolling n steps of GHASH's Horner chain gives
+        Y' = (Y + X_1)*H^n + X_2*H^(n-1) + ... + X_n*H
+    so with H..H^n worked out in advance the n products are independent,
+    and can be added up unreduced and reduced once. Each power gets an
+    8 bit carry-less multiplication window, which is far less to set up
+    than GHASHTable, so this sits between ghash_update and GHASHTable in
+    both setup cost and cost per block.
+    Has the same update and digest methods as GHASHTable.
+    """
+    bits = 8
+
+    def __init__(self, subkey, n=8):
+        if len(subkey) != 16:
+            raise ValueError("GHASH subkey must be 16 bytes, not {0}"
+                             .format(len(subkey)))
+        if n < 1:
+            raise ValueError("Must aggregate at least 1 block, not {0}"
+                             .format(n))
+        self.subkey = subkey
+        self.n = n
+        h = int.from_bytes(subkey, 'big')
+        self.powers = [h]
+        for _ in range(n - 1):
+            self.powers.append(gf128_mul(self.powers[-1], h))
+        # windows[i] is the window for H^(i+1).
+        self.windows = [window(power, self.bits) for power in self.powers]
+
+    def update(self, y, bytes_string):
+        """Continue a GHASH computation from accumulator y over more blocks."""
+        check_blocks(bytes_string)
+        windows, bits, from_bytes = self.windows, self.bits, int.from_bytes
+        for i in range(0, len(bytes_string), 16*self.n):
+            group = bytes_string[i:i + 16*self.n]
+            # The last group may be short, and then starts at a lower power.
+            m = len(group) // 16
+            p = clmul_window(y ^ from_bytes(group[:16], 'big'),
+                             windows[m-1], bits)
+            for j in range(1, m):
+                p ^= clmul_window(from_bytes(group[16*j:16*j + 16], 'big'),
+                                  windows[m-1-j], bits)
+            y = reduce(p)
+        return y
+
+    def digest(self, bytes_string):
+        """GHASH of bytes_string under this subkey, as bytes."""
+        return self.update(0, bytes_string).to_bytes(16, 'big')
@@ -1,7 +1,5 @@
-from os import urandom
-
 import pure_python_gcm.aes_gcm_128 as gcm_hazmat
-import pure_python_gcm.constants as const
+from pure_python_gcm.utilities import as_bytes
 
 
 def encrypt(key, plaintext, assoc_data, encoding='utf-8'):
@@ -20,36 +18,14 @@ def encrypt(key, plaintext, assoc_data, encoding='utf-8'):
         encoding (string): scheme to encode strings as bytes if necessary.
 
     Returns:
-        (cipher, tag, iv) (tuple of bytes objects)
+        (cipher, assoc_data, tag, iv) (tuple of bytes objects)
     """
-    if not isinstance(key, bytes):
-        try:
-            key = key.encode(encoding)
-        except Exception as e:
-            raise TypeError("Key value must be bytes object or string.") from e
+    key = as_bytes(key, encoding, "Key value")
     if len(key) != 16:
         raise ValueError("Key must be 16 bytes"
                          "or a string that decodes to 16 bytes.")
-    if not isinstance(plaintext, bytes):
-        try:
-            plaintext = plaintext.encode(encoding)
-        except Exception as e:
-            raise TypeError("Plaintext must be bytes object or string.") from e
-    if len(plaintext) > const.PLAINTEXT_MAX_LENGTH:
-        raise ValueError("Plaintext exceeds max length {0} bytes"
-                         .format(const.PLAINTEXT_MAX_LENGTH))
-    if not isinstance(assoc_data, bytes):
-        try:
-            assoc_data = assoc_data.encode(encoding)
-        except Exception as e:
-            raise TypeError("Associated data must be bytes object or string.")\
-                from e
-    if len(assoc_data) > const.ASSOC_DATA_MAX_LENGTH:
-        raise ValueError("Associated data exceeds max length {0} bytes."
-                         .format(const.ASSOC_DATA_MAX_LENGTH))
-    iv = urandom(12)
-    cipher, tag = gcm_hazmat.GCM_AE(key, iv, plaintext, assoc_data, 16)
-    return cipher, assoc_data, tag, iv
+    context = gcm_hazmat.GCMContext(key, precompute=False)
+    return context.encrypt(plaintext, assoc_data, encoding)
 
 
 def decrypt(key, cipher, assoc_data, iv, tag):
@@ -78,6 +54,50 @@ def decrypt(key, cipher, assoc_data, iv, tag):
             assoc_data (bytes): authenticated associated data, returned unchanged but determined to be valid.
     """
     try:
-        return gcm_hazmat.GCM_AD(key, iv, cipher, assoc_data, tag, 16)
+        context = gcm_hazmat.GCMContext(key, precompute=False)
+    except Exception as e:
+        raise ValueError("Could not validate message with supplied tag.")
+    return context.decrypt(cipher, assoc_data, iv, tag)
+
+
+def encrypt_many(key, items, encoding='utf-8'):
+    """User-facing AES-GCM-128 encryption of many messages under one key.
+
+    Like calling encrypt on each (plaintext, assoc_data) pair in items,
+    but the key is set up once and the IVs and keystream are made for the
+    whole batch at once, which is much faster for lots of small messages.
+
+    Args:
+        key (bytes or string): 16 byte encryption key value.
+        items (iterable): (plaintext, assoc_data) pairs, bytes or strings.
+        encoding (string): scheme to encode strings as bytes if necessary.
+
+    Returns:
+        list of (cipher, assoc_data, tag, iv) tuples, in order.
+    """
+    key = as_bytes(key, encoding, "Key value")
+    if len(key) != 16:
+        raise ValueError("Key must be 16 bytes"
+                         "or a string that decodes to 16 bytes.")
+    return gcm_hazmat.GCMContext(key).encrypt_many(items, encoding)
+
+
+def decrypt_many(key, items, strict=False):
+    """User-facing AES-GCM-128 decryption of many messages under one key.
+
+    Like calling decrypt on each (cipher, assoc_data, iv, tag) tuple in
+    items, with a message that can't be validated getting a generic
+    ValueError in its place in the results, instead of raising. With
+    strict, it's all or nothing: either every message is authenticated
+    and decrypted, or a generic ValueError is raised giving the index of
+    a message that couldn't be validated.
+
+    Returns:
+        list with (plaintext, assoc_data) for each message, in order, or
+        the generic ValueError for one that couldn't be validated.
+    """
+    try:
+        context = gcm_hazmat.GCMContext(key)
     except Exception as e:
-        raise ValueError("Could not validate message with supplied tag.")
\ No newline at end of file
+        raise ValueError("Could not validate messages with supplied key.")
+    return context.decrypt_many(items, strict)
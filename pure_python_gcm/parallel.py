@@ -0,0 +1,119 @@
+"""GCTR and GHASH sharded across an executor, for large messages.
+
+Counter mode blocks are independent: shard i just starts its counter
+further along. GHASH isn't, but a shard's GHASH can be computed from
+zero and then slotted into place, since for shards S_1, S_2 of m_1 and
+m_2 blocks
+    GHASH(S_1 + S_2) = GHASH(S_1)*H^m_2 + GHASH(S_2).
+
+AES in cryptography runs outside the GIL, so GCTR suits a
+ThreadPoolExecutor. GHASH here is pure Python and holds the GIL, so it
+needs a ProcessPoolExecutor to gain anything. The results are identical
+to the sequential functions either way.
+"""
+from hmac import compare_digest
+from itertools import repeat
+
+from pure_python_gcm.aes_gcm_128 import (AD_arguments_valid, GCMContext,
+                                         check_AE_arguments, gcm_pad, gctr,
+                                         ghash_table, incr)
+from pure_python_gcm.ghash import check_blocks, gf128_mul, gf128_pow
+from pure_python_gcm.utilities import ecb_encryptor
+
+# Bytes per shard. A multiple of 16, and big enough that each shard is
+# worth the trip to a worker.
+SHARD_SIZE = 2**18
+
+
+def _shards(bytes_string):
+    return [bytes_string[i:i + SHARD_SIZE]
+            for i in range(0, len(bytes_string), SHARD_SIZE)]
+
+
+def _gctr_shard(key, counter_block, shard):
+    """GCTR one shard, in a worker."""
+    return gctr(ecb_encryptor(key), counter_block, shard)
+
+
+def _ghash_shard(subkey, shard):
+    """GHASH one shard from zero, in a worker, as an int."""
+    return ghash_table(subkey).update(0, shard)
+
+
+def GCTR_parallel(key, initial_counter_block, bytes_string, executor):
+    """GCTR with one task per shard on executor. Same output as GCTR."""
+    shards = _shards(bytes_string)
+    if len(shards) < 2:
+        return gctr(ecb_encryptor(key), initial_counter_block, bytes_string)
+    counter_blocks = [incr(initial_counter_block, i*(SHARD_SIZE // 16))
+                      for i in range(len(shards))]
+    return b''.join(executor.map(_gctr_shard, repeat(key), counter_blocks,
+                                 shards))
+
+
+def GHASH_parallel(subkey, bytes_string, executor):
+    """GHASH with one task per shard on executor. Same output as GHASH."""
+    check_blocks(bytes_string)
+    shards = _shards(bytes_string)
+    if len(shards) < 2:
+        return ghash_table(subkey).digest(bytes_string)
+    partials = list(executor.map(_ghash_shard, repeat(subkey), shards))
+    # Every shard but the last is full size, so one power of H combines
+    # them, and the last one needs its own.
+    h = int.from_bytes(subkey, 'big')
+    h_full = gf128_pow(h, SHARD_SIZE // 16)
+    h_last = gf128_pow(h, len(shards[-1]) // 16)
+    y = partials[0]
+    for partial in partials[1:-1]:
+        y = gf128_mul(y, h_full) ^ partial
+    y = gf128_mul(y, h_last) ^ partials[-1]
+    return y.to_bytes(16, 'big')
+
+
+def GCM_AE_parallel(key, initial_value, plain_text, assoc_data, tag_length=16,
+                    gctr_executor=None, ghash_executor=None):
+    """GCM_AE with GCTR and GHASH sharded across executors. HAZMAT!
+
+    Either executor can be None, to do that stage in this thread.
+    """
+    check_AE_arguments(initial_value, plain_text, assoc_data, tag_length)
+    context = GCMContext(key, precompute=False)
+    nonce_block = context.pre_counter_block(initial_value)
+    if gctr_executor is None:
+        cipher = context.gctr(incr(nonce_block), plain_text)
+    else:
+        cipher = GCTR_parallel(key, incr(nonce_block), plain_text,
+                               gctr_executor)
+    padded = gcm_pad(assoc_data, cipher)
+    if ghash_executor is None:
+        hash_block = context.ghash(padded)
+    else:
+        hash_block = GHASH_parallel(context.subkey, padded, ghash_executor)
+    return cipher, context.gctr(nonce_block, hash_block)[:tag_length]
+
+
+def GCM_AD_parallel(key, initial_value, cipher, assoc_data, tag,
+                    tag_length=16, gctr_executor=None, ghash_executor=None):
+    """GCM_AD with GCTR and GHASH sharded across executors.
+
+    Either executor can be None, to do that stage in this thread.
+    """
+    if not AD_arguments_valid(initial_value, cipher, assoc_data, tag,
+                              tag_length):
+        raise ValueError("Could not validate message with supplied tag.")
+    context = GCMContext(key, precompute=False)
+    nonce_block = context.pre_counter_block(initial_value)
+    padded = gcm_pad(assoc_data, cipher)
+    if ghash_executor is None:
+        hash_block = context.ghash(padded)
+    else:
+        hash_block = GHASH_parallel(context.subkey, padded, ghash_executor)
+    derived_tag = context.gctr(nonce_block, hash_block)[:tag_length]
+    if not compare_digest(tag, derived_tag):
+        raise ValueError("Could not validate message with supplied tag.")
+    if gctr_executor is None:
+        plain_text = context.gctr(incr(nonce_block), cipher)
+    else:
+        plain_text = GCTR_parallel(key, incr(nonce_block), cipher,
+                                   gctr_executor)
+    return plain_text, assoc_data
@@ -0,0 +1,242 @@
+"""A file format of separately sealed segments, for random access.
+
+One GCM message over a whole file can only be checked, and so only
+safely decrypted, from start to finish. Here the file is cut into
+segments of a fixed size and each is sealed with GCM_AE on its own, so
+any byte range can be decrypted by reading just the segments under it,
+and segments can be encrypted or decrypted side by side on an executor.
+
+A file is laid out as a header and then every segment's ciphertext
+followed by its tag:
+
+    magic (8) | version (1) | segment size (4) | nonce prefix (8) |
+    plaintext length (8) | segment 0 + tag | segment 1 + tag | ...
+
+Segment i is sealed with IV nonce prefix + i (4 bytes), and associated
+data of the whole header, i (4 bytes), a flag byte that is 1 only for
+the final segment, and then any associated data for the file. So a
+segment only opens in its own place in its own file: moving one, or
+dropping some off the end and calling an earlier one the last, or
+changing the header to suit, all make the tags fail. The nonce prefix
+is random for every file, so files under the same key can't share IVs
+unless that 64 bit value happens to repeat.
+"""
+import os
+import struct
+from collections import deque
+from functools import partial
+from itertools import repeat
+
+from pure_python_gcm.aes_gcm_128 import GCM_AD, GCM_AE, GCMContext
+from pure_python_gcm.files import check_paths
+
+MAGIC = b'PPGCMSEG'
+VERSION = 1
+HEADER = struct.Struct('>8sBI8sQ')
+TAG_LENGTH = 16
+# Plaintext bytes per segment, by default.
+SEGMENT_SIZE = 2**16
+# Segments handed to an executor before waiting for the first back.
+IN_FLIGHT = 16
+
+
+def _segment_count(length, segment_size):
+    """Number of segments for length bytes. Always at least one."""
+    return max(1, -(-length // segment_size))
+
+
+def _map(executor, func, *iterables):
+    """Lazy map of func over iterables, in order, on executor if given.
+
+    Keeps at most IN_FLIGHT calls on the executor at once, so the
+    iterables are read no faster than the results are used.
+    """
+    if executor is None:
+        yield from map(func, *iterables)
+        return
+    pending = deque()
+    for args in zip(*iterables):
+        pending.append(executor.submit(func, *args))
+        if len(pending) >= IN_FLIGHT:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class _Header:
+    """The parsed header of a segmented file."""
+    def __init__(self, raw):
+        if len(raw) != HEADER.size:
+            raise ValueError("Could not validate message with supplied tag.")
+        magic, version, self.segment_size, self.nonce_prefix, self.length = (
+            HEADER.unpack(raw))
+        if magic != MAGIC or version != VERSION or self.segment_size == 0:
+            raise ValueError("Not a segmented GCM file.")
+        self.raw = raw
+        self.count = _segment_count(self.length, self.segment_size)
+
+    def file_size(self):
+        return HEADER.size + self.length + self.count*TAG_LENGTH
+
+    def offset(self, index):
+        """Where segment index starts in the file."""
+        return HEADER.size + index*(self.segment_size + TAG_LENGTH)
+
+    def sealed_length(self, index):
+        """Length of segment index with its tag."""
+        if index < self.count - 1:
+            return self.segment_size + TAG_LENGTH
+        return self.length - index*self.segment_size + TAG_LENGTH
+
+    def iv(self, index):
+        return self.nonce_prefix + index.to_bytes(4, 'big')
+
+    def assoc_data(self, index, assoc_data):
+        """Associated data for segment index, given the file's own."""
+        return (self.raw + struct.pack('>IB', index, index == self.count - 1)
+                + assoc_data)
+
+
+def _read_plaintext(f, length, segment_size):
+    """Each segment's plaintext from f, raising if f is short of length."""
+    for start in range(0, max(length, 1), segment_size):
+        expected = min(segment_size, length - start)
+        plain_text = f.read(expected)
+        if len(plain_text) != expected:
+            raise ValueError("Input file changed size while being read.")
+        yield plain_text
+
+
+def _seal_segment(seal, header, assoc_data, index, plain_text):
+    """Ciphertext + tag of one segment, with seal a GCM_AE."""
+    cipher, tag = seal(header.iv(index), plain_text,
+                       header.assoc_data(index, assoc_data))
+    return cipher + tag
+
+
+def _open_segment(open_, header, assoc_data, index, sealed):
+    """Plaintext of one sealed segment, with open_ a GCM_AD."""
+    plain_text, _ = open_(header.iv(index), sealed[:-TAG_LENGTH],
+                          header.assoc_data(index, assoc_data),
+                          sealed[-TAG_LENGTH:])
+    return plain_text
+
+
+def encrypt_file(key, in_path, out_path, assoc_data=b'',
+                 segment_size=SEGMENT_SIZE, executor=None):
+    """Encrypt the file at in_path into a segmented file at out_path.
+
+    Args:
+        key (bytes): 16 byte key.
+        in_path (str): file to encrypt.
+        out_path (str): file to write, overwritten if it exists, but not
+            in_path itself.
+        assoc_data (bytes): additional data to authenticate with every
+            segment, needed again to decrypt.
+        segment_size (int): plaintext bytes per segment.
+        executor (concurrent.futures.Executor or None): to seal segments
+            side by side, or None to do them in turn in this thread.
+
+    Returns:
+        length of the plaintext, in bytes.
+
+    Raises:
+        ValueError: if in_path gets shorter while it's being read, in
+            which case out_path is deleted.
+    """
+    if not 0 < segment_size < 2**32:
+        raise ValueError("Segment size must be between 1 and 2^32 - 1 bytes,"
+                         " not {0}".format(segment_size))
+    check_paths(in_path, out_path)
+    length = os.path.getsize(in_path)
+    count = _segment_count(length, segment_size)
+    if count > 2**32:
+        raise ValueError("Too many segments, make them bigger.")
+    header = _Header(HEADER.pack(MAGIC, VERSION, segment_size,
+                                 os.urandom(8), length))
+    # A shared context in this thread, or something that pickles.
+    if executor is None:
+        seal = GCMContext(key).GCM_AE
+    else:
+        seal = partial(GCM_AE, key)
+    with open(in_path, 'rb') as f_in:
+        try:
+            with open(out_path, 'wb') as f_out:
+                f_out.write(header.raw)
+                for sealed in _map(
+                        executor, _seal_segment, repeat(seal), repeat(header),
+                        repeat(assoc_data), range(count),
+                        _read_plaintext(f_in, length, segment_size)):
+                    f_out.write(sealed)
+        except ValueError:
+            os.remove(out_path)
+            raise
+    return length
+
+
+def _read_header(f):
+    header = _Header(f.read(HEADER.size))
+    if os.fstat(f.fileno()).st_size != header.file_size():
+        raise ValueError("Could not validate message with supplied tag.")
+    return header
+
+
+def decrypt_file(key, in_path, out_path, assoc_data=b'', executor=None):
+    """Decrypt a file written by encrypt_file into a new file at out_path.
+
+    Each segment is authenticated before it's written out. If any fails,
+    out_path is deleted and a generic ValueError is raised.
+
+    Returns:
+        length of the plaintext, in bytes.
+    """
+    if executor is None:
+        open_ = GCMContext(key).GCM_AD
+    else:
+        open_ = partial(GCM_AD, key)
+    check_paths(in_path, out_path)
+    with open(in_path, 'rb') as f_in:
+        header = _read_header(f_in)
+        indices = range(header.count)
+        try:
+            with open(out_path, 'wb') as f_out:
+                for plain_text in _map(
+                        executor, _open_segment, repeat(open_),
+                        repeat(header), repeat(assoc_data), indices,
+                        (f_in.read(header.sealed_length(i)) for i in indices)):
+                    f_out.write(plain_text)
+        except ValueError:
+            os.remove(out_path)
+            raise
+    return header.length
+
+
+def read_range(key, path, start, length, assoc_data=b'', executor=None):
+    """Decrypt length bytes of plaintext from start, of a segmented file.
+
+    Only the segments under the range are read and authenticated. The
+    range is cut short at the end of the file, as with slicing.
+
+    Returns:
+        the plaintext bytes.
+    """
+    if start < 0 or length < 0:
+        raise ValueError("Start and length must not be negative.")
+    if executor is None:
+        open_ = GCMContext(key).GCM_AD
+    else:
+        open_ = partial(GCM_AD, key)
+    with open(path, 'rb') as f:
+        header = _read_header(f)
+        end = min(start + length, header.length)
+        if start >= end:
+            return b''
+        first = start // header.segment_size
+        indices = range(first, (end - 1) // header.segment_size + 1)
+        f.seek(header.offset(first))
+        plain_text = b''.join(_map(
+            executor, _open_segment, repeat(open_), repeat(header),
+            repeat(assoc_data), indices,
+            (f.read(header.sealed_length(i)) for i in indices)))
+    offset = first*header.segment_size
+    return plain_text[start - offset:end - offset]
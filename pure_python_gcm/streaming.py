@@ -0,0 +1,187 @@
+"""Incremental AES-GCM-128, for messages too big to hold in memory.
+
+The running GHASH accumulator, the counter block and the lengths are
+carried between calls, so each piece of data is read once and only a
+partial block is ever kept back.
+"""
+from hmac import compare_digest
+
+import pure_python_gcm.constants as const
+from pure_python_gcm.aes_gcm_128 import GCMContext, incr, xor
+
+
+class _GCMStream:
+    """State shared by GCMEncryptor and GCMDecryptor."""
+    def __init__(self, key_or_context, initial_value, tag_length):
+        if isinstance(key_or_context, GCMContext):
+            self.context = key_or_context
+        else:
+            self.context = GCMContext(key_or_context)
+        if (len(initial_value) < const.IV_MIN_LENGTH
+                or len(initial_value) > const.IV_MAX_LENGTH):
+            raise ValueError("Initialising value must be between {0} and {1}"
+                             " bytes.".format(const.IV_MIN_LENGTH,
+                                              const.IV_MAX_LENGTH))
+        if tag_length not in const.PERMITTED_TAG_LENGTHS:
+            raise ValueError("Tag length {0} bytes not allowed."
+                             .format(tag_length))
+        self.tag_length = tag_length
+        self._nonce_block = self.context.pre_counter_block(initial_value)
+        self._counter_block = incr(self._nonce_block)
+        # Keystream left over from the last partial block of text.
+        self._keystream = b''
+        # GHASH accumulator, and bytes waiting for a full block.
+        self._y, self._pending = 0, b''
+        self._assoc_data_length, self._text_length = 0, 0
+        self._assoc_data_done, self._finalized = False, False
+
+    def _check_not_finalized(self):
+        if self._finalized:
+            raise ValueError("Context was already finalized.")
+
+    def _hash(self, data):
+        """Feed data into GHASH, keeping back any partial final block."""
+        if self._pending:
+            take = 16 - len(self._pending)
+            self._pending += bytes(data[:take])
+            data = data[take:]
+            if len(self._pending) < 16:
+                return
+            self._y = self.context.ghash_update(self._y, self._pending)
+        full = len(data) - len(data) % 16
+        self._y = self.context.ghash_update(self._y, data[:full])
+        self._pending = bytes(data[full:])
+
+    def _pad(self):
+        """Zero pad a partial block into GHASH, ending AAD or text."""
+        if self._pending:
+            self._y = self.context.ghash_update(
+                self._y, self._pending + bytes(16 - len(self._pending)))
+            self._pending = b''
+
+    def _end_assoc_data(self):
+        if not self._assoc_data_done:
+            self._pad()
+            self._assoc_data_done = True
+
+    def _crypt(self, data):
+        """XOR data with the next len(data) bytes of keystream."""
+        out = []
+        if self._keystream:
+            out.append(xor(data, self._keystream))
+            used = len(out[0])
+            self._keystream = self._keystream[used:]
+            data = data[used:]
+        full = len(data) - len(data) % 16
+        if full:
+            out.append(self.context.gctr(self._counter_block, data[:full]))
+            self._counter_block = incr(self._counter_block, full // 16)
+        if full < len(data):
+            keystream = self.context.gctr(self._counter_block, bytes(16))
+            self._counter_block = incr(self._counter_block)
+            out.append(xor(data[full:], keystream))
+            self._keystream = keystream[len(data) - full:]
+        return b''.join(out)
+
+    def update_aad(self, data):
+        """Authenticate more associated data. Must come before any text."""
+        self._check_not_finalized()
+        if self._assoc_data_done:
+            raise ValueError("Associated data must be given before any text.")
+        self._assoc_data_length += len(data)
+        if self._assoc_data_length > const.ASSOC_DATA_MAX_LENGTH:
+            raise ValueError("Associated data exceeds max length {0} bytes."
+                             .format(const.ASSOC_DATA_MAX_LENGTH))
+        self._hash(memoryview(data))
+
+    def _check_text_length(self, data):
+        self._check_not_finalized()
+        self._end_assoc_data()
+        self._text_length += len(data)
+        if self._text_length > const.PLAINTEXT_MAX_LENGTH:
+            raise ValueError("Plaintext exceeds max length {0} bytes"
+                             .format(const.PLAINTEXT_MAX_LENGTH))
+
+    def _derive_tag(self):
+        self._check_not_finalized()
+        self._end_assoc_data()
+        self._pad()
+        self._finalized = True
+        length_block = ((self._assoc_data_length*8).to_bytes(8, 'big')
+                        + (self._text_length*8).to_bytes(8, 'big'))
+        hash_block = self.context.ghash_update(self._y, length_block)
+        return self.context.gctr(self._nonce_block, hash_block.to_bytes(
+            16, 'big'))[:self.tag_length]
+
+
+class GCMEncryptor(_GCMStream):
+    """Streaming GCM authenticated encryption. HAZMAT!
+
+    Give all the associated data to update_aad, then the plaintext to
+    update in pieces of any size, which returns the ciphertext so far.
+    finalize sets self.tag. The result is the same as GCM_AE on the
+    joined-up data.
+
+    Args:
+        key_or_context (bytes or GCMContext): key, or context for the key.
+        initial_value (bytes): IV. Never reuse one under the same key.
+        tag_length (int): length of tag to produce, in bytes.
+    """
+    def __init__(self, key_or_context, initial_value, tag_length=16):
+        super().__init__(key_or_context, initial_value, tag_length)
+        self.tag = None
+
+    def update(self, plain_text):
+        """Encrypt the next piece of plaintext."""
+        self._check_text_length(plain_text)
+        cipher = self._crypt(memoryview(plain_text))
+        self._hash(cipher)
+        return cipher
+
+    def finalize(self):
+        """Finish the message and compute self.tag."""
+        self.tag = self._derive_tag()
+        return b''
+
+
+class GCMDecryptor(_GCMStream):
+    """Streaming GCM authenticated decryption. HAZMAT!
+
+    The mirror image of GCMEncryptor. Note that update hands back
+    plaintext before it has been authenticated: nothing it returns can
+    be trusted until finalize or finalize_with_tag has returned without
+    raising, and it must all be thrown away if they raise.
+
+    Args:
+        key_or_context (bytes or GCMContext): key, or context for the key.
+        initial_value (bytes): IV the message was encrypted with.
+        tag (bytes or None): expected tag, if known before finalize.
+        tag_length (int): length of tag to expect, in bytes.
+    """
+    def __init__(self, key_or_context, initial_value, tag=None,
+                 tag_length=16):
+        super().__init__(key_or_context, initial_value, tag_length)
+        self.tag = tag
+
+    def update(self, cipher):
+        """Decrypt the next piece of ciphertext. Unauthenticated!"""
+        self._check_text_length(cipher)
+        cipher = memoryview(cipher)
+        self._hash(cipher)
+        return self._crypt(cipher)
+
+    def finalize(self):
+        """Finish the message and check it against the tag given earlier."""
+        if self.tag is None:
+            raise ValueError("No tag to check, use finalize_with_tag.")
+        return self.finalize_with_tag(self.tag)
+
+    def finalize_with_tag(self, tag):
+        """Finish the message and check it against tag.
+
+        Raises a generic ValueError if the message can't be validated.
+        """
+        derived_tag = self._derive_tag()
+        if not compare_digest(tag, derived_tag):
+            raise ValueError("Could not validate message with supplied tag.")
+        return b''
@@ -0,0 +1,45 @@
+from os import urandom
+
+import pytest
+
+from pure_python_gcm.gf2_polynomials import PolynomialGF2
+from pure_python_gcm.gf2k import GF2k
+from pure_python_gcm.gf2k.defined_fields import GF2_128
+
+# getArrayFromBytes needs numpy, so skip the module without it.
+pytest.importorskip('numpy')
+
+buffer = urandom(16*20)
+a = GF2_128.getArrayFromBytes(buffer)
+b = GF2_128.getArrayFromBytes(urandom(16*20))
+c = GF2_128.getRandomElement()
+
+
+class TestArrayArithmetic:
+    def test_bytes_round_trip(self):
+        assert a.toBytes() == buffer
+        assert a.toElements() == [GF2_128.getElementFromBytes(buffer[i:i+16])
+                                  for i in range(0, len(buffer), 16)]
+
+    def test_addition(self):
+        assert (a + b).toElements() == [x + y for (x, y) in zip(a, b)]
+
+    def test_multiplication(self):
+        assert (a * b).toElements() == [x * y for (x, y) in zip(a, b)]
+
+    def test_scalar_multiplication(self):
+        assert (a * c).toElements() == [x * c for x in a]
+        assert (a * a[3:4]).toElements() == [x * a[3] for x in a]
+
+    def test_sum(self):
+        total = GF2_128.zero
+        for x in a:
+            total = total + x
+        assert a.sum() == total
+
+    def test_small_field(self):
+        # GF(2^8) from AES, defined by x^8 + x^4 + x^3 + x + 1
+        field = GF2k(8, PolynomialGF2(0x11B))
+        x = field.getArrayFromBytes(bytes(range(256)))
+        y = field.getArrayFromBytes(bytes(range(255, -1, -1)))
+        assert (x * y).toElements() == [s * t for (s, t) in zip(x, y)]
@@ -1,4 +1,8 @@
-from pure_python_gcm.gf2k.defined_fields import GF2_128
+import pytest
+
+from pure_python_gcm.gf2_polynomials import PolynomialGF2
+from pure_python_gcm.gf2k import GF2k, GF2kElement, LogTableElement
+from pure_python_gcm.gf2k.defined_fields import GF2_64, GF2_128, GF2_256
 
 
 def get_random_element():
@@ -45,3 +49,78 @@ class TestPolynomialArithmetic:
 
     def test_cube(self):
         assert a**3 == a*a*a
+
+    def test_bytes_round_trip(self):
+        assert GF2_128.getElementFromBytes(a.toBytes()) == a
+
+    def test_bulk_bytes_conversion(self):
+        buffer = a.toBytes() + b.toBytes() + c.toBytes()
+        bitreps = GF2_128.bitrepsFromBytes(buffer)
+        assert bitreps == [a.poly.bitrep, b.poly.bitrep, c.poly.bitrep]
+        assert GF2_128.bytesFromBitreps(bitreps) == buffer
+
+    def test_zero_and_one_interned(self):
+        assert GF2_128.getElement(0) is GF2_128.zero
+        assert a - a is GF2_128.zero
+        assert a / a is GF2_128.one
+
+    def test_inverse(self):
+        assert a * ~a == one
+        assert a / b * b == a
+        with pytest.raises(ArithmeticError):
+            ~zero
+
+    def test_inversion_methods_agree(self):
+        # The AES field, and GF(2^128)
+        aes_field = GF2k(8, PolynomialGF2(0x11B))
+        for field in (aes_field, GF2_128):
+            for _ in range(10):
+                poly = field.getRandomElement().poly
+                if poly.bitrep:
+                    assert (field.invertItohTsujii(poly)
+                            == field.invertEuclidean(poly))
+
+    def test_inverse_with_reducible_P(self):
+        # x^128 + 1 = (x + 1)^128, so only elements prime to x + 1 invert.
+        field = GF2k(128, PolynomialGF2(2**128 + 1))
+        x = field.getElement(2)
+        assert x * ~x == field.one
+        with pytest.raises(ArithmeticError):
+            ~field.getElement(3)
+
+    def test_log_tables_agree(self):
+        # x^16 + x^5 + x^3 + x + 1
+        P = PolynomialGF2(0x1002B)
+        tables, plain = GF2k(16, P), GF2k(16, P, GF2kElement)
+        assert tables.element_class is LogTableElement
+        assert GF2k(16, P).logTables() is tables.logTables()
+        for x, y in [(0x1234, 0xBEEF), (1, 0xFFFF), (0, 0x42)]:
+            x_, y_ = tables.getElement(x), tables.getElement(y)
+            x, y = plain.getElement(x), plain.getElement(y)
+            assert (x_*y_).poly == (x*y).poly
+            assert (x_**5).poly == (x**5).poly
+            assert (x_/y_).poly == (x/y).poly
+            if x.poly.bitrep:
+                assert (~x_).poly == (~x).poly
+                assert x_**-3 * x_**3 == tables.one
+        with pytest.raises(ArithmeticError):
+            ~tables.zero
+        with pytest.raises(ValueError):
+            # x^8 + 1 = (x + 1)^8
+            GF2k(8, PolynomialGF2(0x101)).logTables()
+
+    def test_no_log_tables_with_reducible_P(self):
+        # x^16 + 1 = (x + 1)^16
+        P = PolynomialGF2(0x10001)
+        field = GF2k(16, P)
+        assert field.element_class is GF2kElement
+        x, y = field.getElement(0x1234), field.getElement(0xBEEF)
+        assert (x*y).poly == (x.poly * y.poly) % P
+
+    def test_defined_fields(self):
+        for field in (GF2_64, GF2_128, GF2_256):
+            assert field.modulus.terms is not None
+            x, y = field.getRandomElement(), field.getRandomElement()
+            assert (x*y).poly == (x.poly * y.poly) % field.P
+            if x.poly.bitrep:
+                assert x * ~x == field.one
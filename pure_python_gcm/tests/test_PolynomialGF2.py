@@ -1,6 +1,8 @@
 from random import randint
 
-from pure_python_gcm.gf2_polynomials import PolynomialGF2
+from pure_python_gcm.gf2_polynomials import Modulus, PolynomialGF2
+from pure_python_gcm.gf2_polynomials.multiplication import (
+    clmul, clmul_karatsuba, clmul_schoolbook, clmul_window, window)
 
 def get_random_element():
     return PolynomialGF2(randint(0, 2**128))
@@ -66,3 +68,38 @@ class TestPolynomialArithmetic:
         if a.deg() >= b.deg():
             a_, b_ = b_, a_
         assert a_**2 % b_ == pow(a_, 2, b_)
+
+    def test_multiplication_algorithms_agree(self):
+        for bits in (1, 7, 200, 300, 9000, 20000):
+            x, y = randint(0, 2**bits), randint(0, 2**(bits + 50))
+            expected = clmul_schoolbook(x, y)
+            assert clmul(x, y) == expected
+            assert clmul_karatsuba(x, y) == expected
+            assert clmul_window(x, window(y, 4), 4) == expected
+
+    def test_modulus_reduction(self):
+        for bits in (1, 5, 64, 128, 1000):
+            m = PolynomialGF2(randint(0, 2**bits) | 2**bits)
+            modulus = Modulus(m)
+            for n in (0, 1, randint(0, 2**bits), randint(0, 2**(3*bits))):
+                assert modulus.reduce(n) == (PolynomialGF2(n) % m).bitrep
+            assert a.modmul(b, modulus) == a.modmul(b, m) == (a*b) % m
+            small = modulus.reduce(a.bitrep)
+            assert modulus.square(small) == modulus.mulmod(small, small)
+            assert pow(a, 5, modulus) == pow(a, 5, m) == (a*a*a*a*a) % m
+
+    def test_pow_with_constant_modulus(self):
+        # Too small for a Modulus, but fine for long division.
+        assert pow(PolynomialGF2(5), 3, PolynomialGF2(1)) == PolynomialGF2(0)
+
+    def test_sparse_modulus_reduction(self):
+        # A trinomial, and pentanomials for GF(2^128) and GF(2^256)
+        for bitrep in (2**233 + 2**74 + 1, 2**128 + 2**7 + 2**2 + 2 + 1,
+                       2**256 + 2**10 + 2**5 + 2**2 + 1):
+            m = PolynomialGF2(bitrep)
+            modulus = Modulus(m)
+            assert modulus.terms is not None
+            k = m.deg()
+            for n in (randint(0, 2**(2*k - 1)), 2**(2*k - 1) - 1,
+                      randint(0, 2**(3*k))):
+                assert modulus.reduce(n) == (PolynomialGF2(n) % m).bitrep
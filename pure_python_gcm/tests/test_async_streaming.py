@@ -0,0 +1,83 @@
+import asyncio
+from os import urandom
+
+import pytest
+
+from pure_python_gcm.aes_gcm_128 import GCM_AE
+from pure_python_gcm.async_streaming import decrypt_stream, encrypt_stream
+
+
+class BufferWriter:
+    """Enough of asyncio.StreamWriter to collect what's written."""
+    def __init__(self):
+        self.buffer = bytearray()
+        self.drains = 0
+
+    def write(self, data):
+        self.buffer += data
+
+    async def drain(self):
+        self.drains += 1
+        await asyncio.sleep(0)
+
+
+def reader_for(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+async def round_trip(key, p, a, chunk_size):
+    encrypted, decrypted = BufferWriter(), BufferWriter()
+    assert await encrypt_stream(key, reader_for(p), encrypted, a,
+                                chunk_size) == len(p)
+    assert await decrypt_stream(key, reader_for(bytes(encrypted.buffer)),
+                                decrypted, a, chunk_size) == len(p)
+    return bytes(encrypted.buffer), bytes(decrypted.buffer)
+
+
+def test_round_trip_matches_one_shot():
+    k, a = urandom(16), urandom(20)
+    for p_length, chunk_size in ((0, 64), (1000, 64), (1000, 10), (5, 4096)):
+        p = urandom(p_length)
+        encrypted, decrypted = asyncio.run(round_trip(k, p, a, chunk_size))
+        assert decrypted == p
+        iv, c, tag = encrypted[:12], encrypted[12:-16], encrypted[-16:]
+        assert GCM_AE(k, iv, p, a) == (c, tag)
+
+
+def test_tampered_or_truncated_stream_fails():
+    k, p = urandom(16), urandom(100)
+    encrypted, _ = asyncio.run(round_trip(k, p, b'', 32))
+
+    async def decrypt(data):
+        await decrypt_stream(k, reader_for(data), BufferWriter(), b'', 32)
+
+    for bad in (encrypted[:-1], encrypted[:20], encrypted[:5],
+                encrypted[:50] + bytes([encrypted[50] ^ 1]) + encrypted[51:]):
+        with pytest.raises(ValueError):
+            asyncio.run(decrypt(bad))
+
+
+def test_loop_keeps_running():
+    ticks = 0
+
+    async def ticker(done):
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    async def main():
+        done = asyncio.Event()
+        task = asyncio.create_task(ticker(done))
+        writer = BufferWriter()
+        await encrypt_stream(urandom(16), reader_for(urandom(2**18)), writer)
+        done.set()
+        await task
+        return writer
+
+    writer = asyncio.run(main())
+    assert writer.drains >= 4
+    assert ticks > 4
@@ -0,0 +1,46 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import urandom
+
+import pytest
+
+from pure_python_gcm import encrypt
+from pure_python_gcm.bulk import decrypt_records, verify_records
+
+
+def make_records(key, n):
+    records = [encrypt(key, bytes([i])*i, urandom(i % 7)) for i in range(n)]
+    # Spoil every fifth record's tag.
+    for i in range(0, n, 5):
+        cipher, assoc_data, tag, iv = records[i]
+        records[i] = (cipher, assoc_data, bytes([tag[0] ^ 1]) + tag[1:], iv)
+    return records
+
+
+def test_decrypt_records_reports_each_failure():
+    k = urandom(16)
+    records = make_records(k, 23)
+    records[7] = records[7][:3]  # not even a record
+    results = list(decrypt_records(k, iter(records), max_workers=2,
+                                   batch_size=4))
+    assert [i for i, _ in results] == list(range(23))
+    for i, result in results:
+        if i % 5 == 0 or i == 7:
+            assert isinstance(result, ValueError)
+        else:
+            assert result == (bytes([i])*i, records[i][1])
+
+
+def test_verify_records_as_completed():
+    k = urandom(16)
+    records = make_records(k, 23) + [(b'', b'', b'short', b''), (b'',)]
+    with ProcessPoolExecutor(2) as executor:
+        results = dict(verify_records(k, records, executor, 2, batch_size=3,
+                                      ordered=False))
+    assert results == {i: i % 5 != 0 and i < 23 for i in range(25)}
+
+
+def test_bad_key_raises_at_once():
+    with pytest.raises(ValueError):
+        decrypt_records(b'short', [])
+    with pytest.raises(ValueError):
+        verify_records(b'short', [])
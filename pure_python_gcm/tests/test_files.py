@@ -0,0 +1,63 @@
+from os import urandom
+
+import pytest
+
+from pure_python_gcm.__main__ import main
+from pure_python_gcm.files import decrypt_file, encrypt_file
+
+
+@pytest.mark.parametrize('length', [0, 15, 3000])
+def test_file_round_trip(tmp_path, length):
+    key, data = urandom(16), urandom(length)
+    (tmp_path / 'plain').write_bytes(data)
+    assert encrypt_file(key, str(tmp_path / 'plain'), str(tmp_path / 'enc'),
+                        b'assoc') == length
+    assert (tmp_path / 'enc').stat().st_size == length + 28
+    decrypt_file(key, str(tmp_path / 'enc'), str(tmp_path / 'dec'), b'assoc')
+    assert (tmp_path / 'dec').read_bytes() == data
+
+
+def test_file_tampered(tmp_path):
+    key = urandom(16)
+    (tmp_path / 'plain').write_bytes(urandom(100))
+    encrypt_file(key, str(tmp_path / 'plain'), str(tmp_path / 'enc'))
+    enc = bytearray((tmp_path / 'enc').read_bytes())
+    enc[50] ^= 1
+    (tmp_path / 'enc').write_bytes(enc)
+    with pytest.raises(ValueError):
+        decrypt_file(key, str(tmp_path / 'enc'), str(tmp_path / 'dec'))
+    assert not (tmp_path / 'dec').exists()
+
+
+def test_command_line(tmp_path):
+    (tmp_path / 'key').write_bytes(urandom(16).hex().encode())
+    (tmp_path / 'plain').write_bytes(b'YELLOW SUBMARINE')
+    paths = [str(tmp_path / name) for name in ('key', 'plain', 'enc', 'dec')]
+    assert main(['encrypt', paths[0], paths[1], paths[2]]) == 0
+    assert main(['decrypt', paths[0], paths[2], paths[3]]) == 0
+    assert (tmp_path / 'dec').read_bytes() == b'YELLOW SUBMARINE'
+    assert main(['decrypt', paths[0], paths[2], paths[3],
+                 '--assoc-data', 'wrong']) == 1
+
+
+def test_same_input_and_output_refused(tmp_path):
+    key, data = urandom(16), urandom(100)
+    (tmp_path / 'plain').write_bytes(data)
+    path = str(tmp_path / 'plain')
+    with pytest.raises(ValueError):
+        encrypt_file(key, path, path)
+    with pytest.raises(ValueError):
+        decrypt_file(key, path, path)
+    assert (tmp_path / 'plain').read_bytes() == data
+
+
+def test_command_line_errors(tmp_path):
+    (tmp_path / 'key').write_bytes(b'too short')
+    (tmp_path / 'plain').write_bytes(b'YELLOW SUBMARINE')
+    key, plain, missing = (str(tmp_path / name)
+                           for name in ('key', 'plain', 'missing'))
+    assert main(['encrypt', key, plain, str(tmp_path / 'enc')]) == 1
+    assert main(['encrypt', missing, plain, str(tmp_path / 'enc')]) == 1
+    (tmp_path / 'key').write_bytes(urandom(16))
+    assert main(['encrypt', key, plain, plain]) == 1
+    assert (tmp_path / 'plain').read_bytes() == b'YELLOW SUBMARINE'
@@ -1,8 +1,18 @@
 from binascii import unhexlify
+from os import urandom
 
-from pure_python_gcm import decrypt
-from pure_python_gcm.aes_gcm_128 import GCM_AE, GHASH, gcm_pad
-from pure_python_gcm.utilities import encrypt_block
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+import pure_python_gcm.aes_gcm_128 as aes_gcm_128
+from pure_python_gcm import GCMContext, decrypt, decrypt_many, encrypt_many
+from pure_python_gcm.aes_gcm_128 import (GCM_AE, GCTR, GHASH, GHASH_reference,
+                                         gcm_pad, gmac, gmac_verify, incr,
+                                         instrument, verify_only, xor)
+from pure_python_gcm.gf2k.defined_fields import GF2_128
+from pure_python_gcm.ghash import (AggregatedGHASH, GHASHTable, gf128_mul,
+                                   gf128_pow, ghash_update)
+from pure_python_gcm.utilities import as_bytes, encrypt_block
 
 
 def test_54_byte_packet_authentication():
@@ -51,4 +61,155 @@ def test_tampered_tag():
         (p, a) = decrypt(k, c, a, iv, tag)
         assert False  # we should get an exception and never execute this
     except ValueError as e:
-        assert True
\ No newline at end of file
+        assert True
+
+def test_ghash_matches_reference():
+    subkey = urandom(16)
+    for length in (0, 16, 48, 16*33, 16*65):
+        bytes_string = urandom(length)
+        expected = GHASH_reference(subkey, bytes_string)
+        assert GHASH(subkey, bytes_string) == expected
+        assert GHASHTable(subkey, bits=4).digest(bytes_string) == expected
+        for n in (1, 3, 8):
+            assert AggregatedGHASH(subkey, n).digest(bytes_string) == expected
+        assert ghash_update(int.from_bytes(subkey, 'big'), 0, bytes_string)\
+            == int.from_bytes(expected, 'big')
+
+
+def test_gf128_mul_matches_field():
+    for _ in range(20):
+        x, y = urandom(16), urandom(16)
+        expected = (GF2_128.getElementFromBytes(x)
+                    * GF2_128.getElementFromBytes(y)).toBytes()
+        product = gf128_mul(int.from_bytes(x, 'big'), int.from_bytes(y, 'big'))
+        assert product.to_bytes(16, 'big') == expected
+
+
+def test_gf128_pow_matches_field():
+    x = urandom(16)
+    for power in (0, 1, 2, 7, 2**128 - 2):
+        expected = (GF2_128.getElementFromBytes(x) ** power).toBytes()
+        result = gf128_pow(int.from_bytes(x, 'big'), power)
+        assert result.to_bytes(16, 'big') == expected
+
+
+def test_gctr_counter_wraparound(monkeypatch):
+    # Small chunks, so the wraparound happens between and within chunks.
+    monkeypatch.setattr(aes_gcm_128, 'GCTR_CHUNK_BLOCKS', 2)
+    k = urandom(16)
+    counter_block = urandom(12) + (2**32 - 3).to_bytes(4, 'big')
+    bytes_string = urandom(16*6 + 5)
+    keystream = b''
+    for _ in range(7):
+        keystream += encrypt_block(k, counter_block)
+        counter_block = incr(counter_block)
+    assert counter_block[-4:] == (4).to_bytes(4, 'big')
+    initial_counter_block = counter_block[:-4] + (2**32 - 3).to_bytes(4, 'big')
+    assert (GCTR(k, initial_counter_block, bytes_string)
+            == xor(bytes_string, keystream))
+
+
+def test_context_matches_one_shot():
+    k = urandom(16)
+    context = GCMContext(k)
+    aggregated = GCMContext(k, ghash='aggregated', n=3)
+    for iv_length, p_length in ((12, 0), (12, 100), (1, 33), (60, 2000)):
+        iv, p, a = urandom(iv_length), urandom(p_length), urandom(20)
+        c, tag = context.GCM_AE(iv, p, a)
+        assert (c, tag) == GCM_AE(k, iv, p, a) == aggregated.GCM_AE(iv, p, a)
+        assert context.GCM_AD(iv, c, a, tag) == (p, a)
+    with pytest.raises(ValueError):
+        GCMContext(k, ghash='tables')
+    c, a, tag, iv = context.encrypt(b'YELLOW SUBMARINE', "assoc")
+    assert decrypt(k, c, a, iv, tag) == (b'YELLOW SUBMARINE', b'assoc')
+    with pytest.raises(ValueError):
+        context.decrypt(c, b'ASSOC', iv, tag)
+
+
+def test_long_iv_matches_cryptography():
+    k, iv, p, a = urandom(16), urandom(20), urandom(40), urandom(7)
+    c, tag = GCM_AE(k, iv, p, a)
+    assert AESGCM(k).encrypt(iv, p, a) == c + tag
+
+
+def test_xor_truncates_to_shorter():
+    assert xor(b'\x0f\xf0\xff', b'\xff\xff') == b'\xf0\x0f'
+    assert xor(b'\xff', b'\x01\x02') == b'\xfe'
+    assert xor(b'', b'abc') == b''
+
+
+def test_encrypt_decrypt_many():
+    k = urandom(16)
+    items = [(urandom(length), urandom(length % 7)) for length in
+             (0, 1, 16, 64, 100, 512)] + [("string", "assoc")]
+    results = encrypt_many(k, items)
+    for (p, a), (c, a_, tag, iv) in zip(items, results):
+        assert decrypt(k, c, a_, iv, tag) == (as_bytes(p, 'utf-8', ''), a_)
+    assert decrypt_many(k, [(c, a, iv, tag)
+                            for (c, a, tag, iv) in results]) \
+        == [(as_bytes(p, 'utf-8', ''), as_bytes(a, 'utf-8', ''))
+            for (p, a) in items]
+    c, a, tag, iv = results[3]
+    good = (c, a, iv, tag)
+    forged = (c, a, iv, tag[:-1] + bytes([tag[-1] ^ 1]))
+    long_iv = urandom(30)
+    long_c, long_tag = GCM_AE(k, long_iv, b'p'*40, b'a')
+    batch = [good, forged, (c, a), good, (long_c, b'a', long_iv, long_tag)]
+    context = GCMContext(k)
+    with instrument() as stats:
+        first, bad, malformed, last, long = context.decrypt_many(batch)
+    # One AES call for the tag masks and one for the keystream.
+    assert stats.as_dict()['gctr']['aes_calls'] == 2
+    assert first == last == decrypt(k, *good)
+    assert long == (b'p'*40, b'a')
+    assert isinstance(bad, ValueError) and isinstance(malformed, ValueError)
+    with pytest.raises(ValueError, match="message 1 "):
+        decrypt_many(k, batch, strict=True)
+
+
+def test_verify_only():
+    k, iv, p, a = urandom(16), urandom(12), urandom(50), urandom(10)
+    c, tag = GCM_AE(k, iv, p, a)
+    assert verify_only(k, iv, c, a, tag)
+    assert not verify_only(k, iv, c[:-1], a, tag)
+    assert not verify_only(k, iv, c, a, tag[:12])
+    assert GCMContext(k).verify_only(iv, c, a, tag)
+    # Right length, wrong type: still just False.
+    assert not verify_only(k, iv, c, a, 'x'*16)
+    assert not GCMContext(k).verify_only(iv, c, a, 'x'*16)
+    assert not gmac_verify(k, iv, a, 'x'*16)
+    assert not GCMContext(k).gmac_verify(iv, a, 'x'*16)
+
+
+def test_instrument_counts_stages():
+    key, iv, p, a = urandom(16), urandom(20), urandom(100), urandom(5)
+    with instrument() as stats:
+        GCM_AE(key, iv, p, a)
+    stages = stats.as_dict()
+    assert stages['subkey']['aes_calls'] == 1
+    assert stages['iv_ghash']['blocks'] == 3
+    assert stages['gctr']['calls'] == 2
+    assert stages['gctr']['bytes'] == 100 + 16
+    assert stages['padding']['bytes'] == 105
+    assert stages['tag_ghash']['blocks'] == 1 + 7 + 1
+    assert all(counts['seconds'] >= 0 for counts in stages.values())
+    # Nothing is recorded once the with block is over.
+    GCM_AE(key, iv, p, a)
+    assert stats.as_dict() == stages
+
+
+def test_gmac_matches_gcm_ae():
+    k = urandom(16)
+    context = GCMContext(k)
+    for iv_length, a_length, tag_length in ((12, 0, 16), (12, 17, 16),
+                                            (12, 2000, 12), (40, 33, 16)):
+        iv, a = urandom(iv_length), urandom(a_length)
+        tag = GCM_AE(k, iv, b'', a, tag_length)[1]
+        assert gmac(k, iv, a, tag_length) == tag
+        assert context.gmac(iv, a, tag_length) == tag
+        assert gmac_verify(k, iv, a, tag, tag_length)
+        assert context.gmac_verify(iv, a, tag, tag_length)
+        assert not gmac_verify(k, iv, a + b'!', tag, tag_length)
+        assert not context.gmac_verify(iv, a, tag[:-1], tag_length)
+    iv, a = urandom(12), urandom(50)
+    assert gmac(k, iv, a) == AESGCM(k).encrypt(iv, b'', a)
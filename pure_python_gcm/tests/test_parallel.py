@@ -0,0 +1,38 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from os import urandom
+
+import pytest
+
+import pure_python_gcm.parallel as parallel
+from pure_python_gcm.aes_gcm_128 import GCM_AE, GCTR, GHASH
+
+
+@pytest.fixture(autouse=True)
+def small_shards(monkeypatch):
+    monkeypatch.setattr(parallel, 'SHARD_SIZE', 64)
+
+
+def test_parallel_gctr_ghash_match_sequential():
+    k, subkey = urandom(16), urandom(16)
+    counter_block = urandom(12) + (2**32 - 5).to_bytes(4, 'big')
+    with ThreadPoolExecutor(4) as executor:
+        for length in (0, 16, 64, 200, 64*5):
+            bytes_string = urandom(length)
+            assert (parallel.GCTR_parallel(k, counter_block, bytes_string,
+                                           executor)
+                    == GCTR(k, counter_block, bytes_string))
+            bytes_string = bytes_string[:length - length % 16]
+            assert (parallel.GHASH_parallel(subkey, bytes_string, executor)
+                    == GHASH(subkey, bytes_string))
+
+
+def test_parallel_gcm_with_processes():
+    k, iv, p, a = urandom(16), urandom(12), urandom(300), urandom(70)
+    with ThreadPoolExecutor(2) as threads, ProcessPoolExecutor(2) as processes:
+        c, tag = parallel.GCM_AE_parallel(k, iv, p, a, 16, threads, processes)
+        assert (c, tag) == GCM_AE(k, iv, p, a)
+        assert parallel.GCM_AD_parallel(k, iv, c, a, tag, 16, threads,
+                                        processes) == (p, a)
+        with pytest.raises(ValueError):
+            parallel.GCM_AD_parallel(k, iv, c, a[1:], tag, 16, threads,
+                                     processes)
@@ -0,0 +1,75 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import urandom
+
+import pytest
+
+from pure_python_gcm import segmented
+from pure_python_gcm.segmented import decrypt_file, encrypt_file, read_range
+
+
+@pytest.fixture
+def encrypted(tmp_path):
+    k, p, a = urandom(16), urandom(1000), b'file name'
+    (tmp_path / 'plain').write_bytes(p)
+    encrypt_file(k, str(tmp_path / 'plain'), str(tmp_path / 'sealed'), a,
+                 segment_size=64)
+    return k, p, a, tmp_path / 'sealed'
+
+
+def test_round_trip_and_ranges(encrypted, tmp_path):
+    k, p, a, path = encrypted
+    assert path.stat().st_size == segmented.HEADER.size + 1000 + 16*16
+    assert decrypt_file(k, str(path), str(tmp_path / 'out'), a) == 1000
+    assert (tmp_path / 'out').read_bytes() == p
+    for start, length in ((0, 1000), (0, 1), (63, 2), (100, 500),
+                          (990, 100), (1000, 5), (128, 0)):
+        plain = read_range(k, str(path), start, length, a)
+        assert plain == p[start:start + length]
+
+
+def test_empty_file_and_executor(tmp_path):
+    k = urandom(16)
+    for length in (0, 64*5, 300):
+        p = urandom(length)
+        (tmp_path / 'plain').write_bytes(p)
+        with ProcessPoolExecutor(2) as executor:
+            encrypt_file(k, str(tmp_path / 'plain'), str(tmp_path / 'sealed'),
+                         segment_size=64, executor=executor)
+            decrypt_file(k, str(tmp_path / 'sealed'), str(tmp_path / 'out'),
+                         executor=executor)
+        assert (tmp_path / 'out').read_bytes() == p
+
+
+def test_tampering_detected(encrypted, tmp_path):
+    k, p, a, path = encrypted
+    sealed = path.read_bytes()
+    n, segment = segmented.HEADER.size, 64 + 16
+    header, body = sealed[:n], sealed[n:]
+    # 1000 bytes is 15 full segments and one of 40.
+    short_header = header[:-8] + (15*64).to_bytes(8, 'big')
+    for bad in (header + body[segment:2*segment] + body[:segment]
+                + body[2*segment:],  # reordered
+                header + body[:-1],  # truncated
+                short_header + body[:15*segment],  # last segment dropped
+                header + body[:5] + bytes([body[5] ^ 1]) + body[6:]):
+        path.write_bytes(bad)
+        with pytest.raises(ValueError):
+            decrypt_file(k, str(path), str(tmp_path / 'out'), a)
+        assert not (tmp_path / 'out').exists()
+    path.write_bytes(sealed)
+    with pytest.raises(ValueError):
+        read_range(k, str(path), 0, 10, b'other file name')
+
+
+def test_input_not_overwritten_or_short(tmp_path, monkeypatch):
+    k, p = urandom(16), urandom(1000)
+    (tmp_path / 'plain').write_bytes(p)
+    path = str(tmp_path / 'plain')
+    with pytest.raises(ValueError):
+        encrypt_file(k, path, path)
+    assert (tmp_path / 'plain').read_bytes() == p
+    # As if the file shrank after its size was taken.
+    monkeypatch.setattr(segmented.os.path, 'getsize', lambda path: 1100)
+    with pytest.raises(ValueError):
+        encrypt_file(k, path, str(tmp_path / 'sealed'), segment_size=64)
+    assert not (tmp_path / 'sealed').exists()
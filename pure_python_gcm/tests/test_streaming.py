@@ -0,0 +1,59 @@
+from os import urandom
+from random import randint
+
+import pytest
+
+from pure_python_gcm import GCMContext
+from pure_python_gcm.aes_gcm_128 import GCM_AE
+from pure_python_gcm.streaming import GCMDecryptor, GCMEncryptor
+
+
+def split_randomly(bytes_string):
+    pieces, i = [], 0
+    while i < len(bytes_string):
+        j = i + randint(0, 40)
+        pieces.append(bytes_string[i:j])
+        i = j
+    return pieces
+
+
+def test_stream_matches_one_shot():
+    k = urandom(16)
+    context = GCMContext(k)
+    for iv_length, p_length, a_length in ((12, 0, 0), (12, 200, 37),
+                                          (30, 17, 0), (12, 0, 64)):
+        iv, p, a = urandom(iv_length), urandom(p_length), urandom(a_length)
+        c, tag = GCM_AE(k, iv, p, a)
+        encryptor = GCMEncryptor(context, iv)
+        for piece in split_randomly(a):
+            encryptor.update_aad(piece)
+        c_ = b''.join(encryptor.update(piece) for piece in split_randomly(p))
+        assert c_ + encryptor.finalize() == c
+        assert encryptor.tag == tag
+        decryptor = GCMDecryptor(k, iv, tag)
+        for piece in split_randomly(a):
+            decryptor.update_aad(piece)
+        p_ = b''.join(decryptor.update(piece) for piece in split_randomly(c))
+        assert p_ + decryptor.finalize() == p
+
+
+def test_stream_tampered_tag():
+    k, iv = urandom(16), urandom(12)
+    encryptor = GCMEncryptor(k, iv)
+    encryptor.update_aad(b'assoc')
+    c = encryptor.update(b'YELLOW SUBMARINE') + encryptor.finalize()
+    decryptor = GCMDecryptor(k, iv)
+    decryptor.update_aad(b'ASSOC')
+    decryptor.update(c)
+    with pytest.raises(ValueError):
+        decryptor.finalize_with_tag(encryptor.tag)
+
+
+def test_stream_misuse():
+    encryptor = GCMEncryptor(urandom(16), urandom(12))
+    encryptor.update(b'text')
+    with pytest.raises(ValueError):
+        encryptor.update_aad(b'too late')
+    encryptor.finalize()
+    with pytest.raises(ValueError):
+        encryptor.update(b'more text')
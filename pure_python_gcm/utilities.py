@@ -35,6 +35,20 @@ def print_polynomial(coefs, zero, one, letter="x"):
     return out
 
 
+def as_bytes(value, encoding, description):
+    """Return value as bytes, encoding it first if it's a string.
+
+    description names the value in the TypeError raised if that fails.
+    """
+    if isinstance(value, bytes):
+        return value
+    try:
+        return value.encode(encoding)
+    except Exception as e:
+        raise TypeError("{0} must be bytes object or string."
+                        .format(description)) from e
+
+
 def reverse_bits(n):
     """Function to invert endianness of one byte on a bit level.
 
@@ -49,12 +63,27 @@ def reverse_bits(n):
     return n
 
 
+# reverse_bits of every byte value, for use with bytes.translate, which
+# reverses the bits of every byte of a whole buffer in one call.
+REVERSED_BYTES = bytes(reverse_bits(n) for n in range(256))
+
+
+def ecb_encryptor(key):
+    """AES-ECB encryptor, for encrypting any number of whole blocks.
+
+    Its update method can be called repeatedly. Never finalize it if you
+    want to keep using it.
+    """
+    if len(key) != 16:
+        raise ValueError("AES is only used with a 16 byte key")
+    return Cipher(algorithms.AES(key), modes.ECB(),
+                  backend=default_backend()).encryptor()
+
+
 def encrypt_block(key, block):
     """Primitive function to AES encrypt one block."""
     if len(block) != 16:
         raise ValueError("encrypt_block only works on single 16 byte blocks")
     if len(key) != 16:
         raise ValueError("encrypt_block only uses a 16 byte key")
-    encryptor = Cipher(algorithms.AES(key), modes.ECB(),
-                       backend=default_backend()).encryptor()
-    return encryptor.update(block) + encryptor.finalize()
\ No newline at end of file
+    return ecb_encryptor(key).update(block)
\ No newline at end of file